@@ -0,0 +1,270 @@
+# admission.py
+
+import argparse
+import asyncio
+import bisect
+import json
+import math
+import time
+from collections import OrderedDict
+from fractions import Fraction
+
+import config
+from analysis import minimum_feasible_frequency
+
+# Admission control as a local service: "can this task join the set, and
+# at what static frequency would the set then run?" Clients speak one JSON
+# object per line over localhost TCP or a Unix socket and get one JSON
+# line back per request, in order, so requests can be pipelined.
+#
+#   {"op": "admit", "set": "cam", "task": {"name": "T3", "execution_time_sec": 2, "period_sec": 10}}
+#   {"op": "check", ...}   same test, but the set is left unchanged
+#   {"op": "remove", "set": "cam", "name": "T3"}
+#   {"op": "status", "set": "cam"}   {"op": "clear", "set": "cam"}
+#
+# admit and check take "exact": true to use processor demand analysis,
+# which sets with constrained deadlines always get.
+
+
+class TaskSetState:
+    # One named task set. Utilization is kept as an exact fraction of
+    # ticks, updated in O(1) per added or removed task, and the frequency
+    # for a utilization is found by bisection over the table, O(log F).
+
+    def __init__(self, cfg):
+        self.cfg = cfg
+        self.tasks = {}  # name -> (task dict, utilization)
+        self.utilization = Fraction(0)
+        self.constrained = 0  # tasks with deadline < period
+        self.exact = None  # memoized minimum_feasible_frequency() of the current set
+
+    def parameters(self, info):
+        cfg = self.cfg
+        for key in ("execution_time_sec", "period_sec", "deadline_sec"):
+            value = info.get(key)
+            if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))
+                                      or not math.isfinite(value)):
+                raise ValueError(f"{key} must be a finite number")
+        c, p = cfg.ticks(info["execution_time_sec"]), cfg.ticks(info["period_sec"])
+        if c <= 0 or p <= 0:
+            raise ValueError("execution_time_sec and period_sec must be at least one tick")
+        d = info.get("deadline_sec")
+        return Fraction(c, p), d is not None and cfg.ticks(d) < p
+
+    def add(self, info, utilization, constrained):
+        self.tasks[info["name"]] = (info, utilization)
+        self.utilization += utilization
+        self.constrained += constrained
+        self.exact = None
+
+    def remove(self, name):
+        info, utilization = self.tasks.pop(name)
+        self.utilization -= utilization
+        self.constrained -= self.parameters(info)[1]
+        self.exact = None
+
+    def frequency_for(self, utilization):
+        # Lowest operating point covering `utilization`, or None above 1
+        cfg = self.cfg
+        i = bisect.bisect_left(cfg.frequency_list, utilization * Fraction(cfg.max_frequency))
+        if i == len(cfg.frequency_list):
+            return None
+        return cfg.frequency_list[i], cfg.power_list[i]
+
+
+class AdmissionController:
+    def __init__(self, cfg=None, exact_cache_entries=4096):
+        self.cfg = cfg or config.current()
+        self.sets = {}
+        # Exact answers by task set content, shared by all sets: clients
+        # often probe the same candidate sets again
+        self.exact_cache = OrderedDict()
+        self.exact_cache_entries = exact_cache_entries
+        self.requests = 0
+
+    def state(self, name):
+        state = self.sets.get(name)
+        if state is None:
+            state = self.sets[name] = TaskSetState(self.cfg)
+        return state
+
+    def exact_frequency(self, tasks):
+        key = tuple(sorted((t["execution_time_sec"], t["period_sec"], t.get("deadline_sec") or t["period_sec"])
+                           for t in tasks))
+        if key in self.exact_cache:
+            self.exact_cache.move_to_end(key)
+            return self.exact_cache[key]
+        chosen = minimum_feasible_frequency(tasks, self.cfg)
+        self.exact_cache[key] = chosen
+        if len(self.exact_cache) > self.exact_cache_entries:
+            self.exact_cache.popitem(last=False)
+        return chosen
+
+    def handle(self, request):
+        self.requests += 1
+        if not isinstance(request, dict):
+            raise ValueError("A request must be a JSON object")
+        op = request.get("op")
+        if op in ("admit", "check"):
+            state = self.state(request["set"])
+            if not isinstance(request["task"], dict):
+                raise ValueError("task must be a JSON object")
+            info = dict(request["task"])
+            if info.get("deadline_sec", 0) is None:
+                # null means an implicit deadline, as if the key were missing
+                del info["deadline_sec"]
+            info.setdefault("name", f"Task{len(state.tasks) + 1}")
+            if op == "admit" and info["name"] in state.tasks:
+                raise ValueError(f"{info['name']} is already in set {request['set']}")
+            utilization, constrained = state.parameters(info)
+            total = state.utilization + utilization
+            exact = request.get("exact", False) or constrained or state.constrained
+            if total > 1:
+                admitted, chosen = False, None
+            elif exact:
+                chosen = self.exact_frequency([task for task, _ in state.tasks.values()] + [info])
+                admitted = chosen is not None
+            else:
+                admitted, chosen = True, state.frequency_for(total)
+            if admitted and op == "admit":
+                state.add(info, utilization, constrained)
+                if exact:
+                    state.exact = chosen
+            response = {"ok": True, "admitted": admitted, "utilization": float(total)}
+            if chosen is not None:
+                response["frequency"], response["power"] = chosen
+            return response
+        if op == "remove":
+            state = self.state(request["set"])
+            state.remove(request["name"])
+            return {"ok": True, **self.summary(state)}
+        if op == "status":
+            return {"ok": True, **self.summary(self.state(request["set"]))}
+        if op == "clear":
+            self.sets.pop(request["set"], None)
+            return {"ok": True}
+        raise ValueError(f"Unknown op {op!r}")
+
+    def summary(self, state):
+        if state.constrained:
+            if state.exact is None and state.tasks:
+                state.exact = self.exact_frequency([task for task, _ in state.tasks.values()])
+            chosen = state.exact
+        else:
+            chosen = state.frequency_for(state.utilization)
+        response = {"tasks": len(state.tasks), "utilization": float(state.utilization)}
+        if chosen is not None:
+            response["frequency"], response["power"] = chosen
+        return response
+
+    def handle_line(self, line):
+        try:
+            return json.dumps(self.handle(json.loads(line)), separators=(",", ":"))
+        except (ValueError, KeyError, TypeError, AttributeError, OverflowError) as e:
+            # Any bad request gets an answer; the connection stays open
+            return json.dumps({"ok": False, "error": str(e) or type(e).__name__}, separators=(",", ":"))
+
+    async def serve_client(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                writer.write(self.handle_line(line).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+async def start_server(controller, host="127.0.0.1", port=8558, unix=None):
+    if unix:
+        return await asyncio.start_unix_server(controller.serve_client, unix)
+    return await asyncio.start_server(controller.serve_client, host, port)
+
+
+# ---- Load test client ----
+
+async def open_connection(host, port, unix):
+    if unix:
+        return await asyncio.open_unix_connection(unix)
+    return await asyncio.open_connection(host, port)
+
+
+async def load_client(client, requests, window, host, port, unix, latencies):
+    # Keeps up to `window` requests in flight on one connection
+    reader, writer = await open_connection(host, port, unix)
+    sent = received = 0
+    sent_at = []
+    set_name = f"load{client}"
+    while received < requests:
+        while sent < requests and sent - received < window:
+            i = sent
+            if i % 4 == 3:
+                request = {"op": "remove", "set": set_name, "name": f"T{i - 1}"}
+            else:
+                request = {"op": "admit" if i % 4 == 2 else "check", "set": set_name, "exact": i % 8 == 0,
+                           "task": {"name": f"T{i}", "execution_time_sec": 1 + i % 3, "period_sec": 20 + i % 7 * 5}}
+            writer.write(json.dumps(request).encode() + b"\n")
+            sent_at.append(time.perf_counter())
+            sent += 1
+        await writer.drain()
+        line = await reader.readline()
+        latencies.append(time.perf_counter() - sent_at[received])
+        if not json.loads(line)["ok"]:
+            raise RuntimeError(f"Request {received} failed: {line.decode().strip()}")
+        received += 1
+    writer.close()
+
+
+async def load_test(requests=20000, connections=8, window=32, host="127.0.0.1", port=8558, unix=None,
+                    controller=None):
+    # With a controller, the server runs in this process for the test
+    server = None
+    if controller is not None:
+        server = await start_server(controller, host, port, unix)
+    latencies = []
+    start = time.perf_counter()
+    per_client = requests // connections
+    await asyncio.gather(*(load_client(c, per_client, window, host, port, unix, latencies)
+                           for c in range(connections)))
+    elapsed = time.perf_counter() - start
+    if server is not None:
+        server.close()
+        await server.wait_closed()
+    latencies.sort()
+    count = len(latencies)
+    return {"requests": count, "seconds": elapsed, "per_second": count / elapsed,
+            "p50_ms": latencies[count // 2] * 1e3, "p99_ms": latencies[min(count - 1, count * 99 // 100)] * 1e3}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="EDF admission control service and load tester")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8558)
+    parser.add_argument("--unix", metavar="PATH", help="use a Unix socket instead of TCP")
+    parser.add_argument("--load", action="store_true", help="run the load test client against a server")
+    parser.add_argument("--inline", action="store_true", help="--load: start the server in this process")
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--connections", type=int, default=8)
+    parser.add_argument("--window", type=int, default=32, help="requests in flight per connection")
+    args = parser.parse_args()
+
+    if args.load:
+        result = asyncio.run(load_test(args.requests, args.connections, args.window, args.host, args.port, args.unix,
+                                       AdmissionController() if args.inline else None))
+        print(f"{result['requests']} requests in {result['seconds']:.2f}s: {result['per_second']:.0f} req/s, "
+              f"p50 {result['p50_ms']:.2f} ms, p99 {result['p99_ms']:.2f} ms")
+    else:
+        async def serve():
+            server = await start_server(AdmissionController(), args.host, args.port, args.unix)
+            print(f"Admission control listening on {args.unix or f'{args.host}:{args.port}'}")
+            async with server:
+                await server.serve_forever()
+        try:
+            asyncio.run(serve())
+        except KeyboardInterrupt:
+            pass
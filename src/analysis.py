@@ -0,0 +1,117 @@
+# analysis.py
+
+import argparse
+import math
+import time
+from fractions import Fraction
+
+import config
+from task import completion_ticks
+
+# Exact EDF feasibility through processor demand analysis, using Quick
+# Processor-demand Analysis (QPA, Zhang & Burns 2009) to visit only a few
+# of the absolute deadlines. Everything is in integer ticks, with execution
+# times scaled to the frequency the same way the simulator runs them.
+
+
+def task_parameters(tasks_info, frequency, cfg=None):
+    # (C, T, D) in ticks at `frequency`; "deadline_sec" gives a constrained deadline
+    cfg = cfg or config.current()
+    work_per_tick = frequency / cfg.max_frequency
+    params = []
+    for info in tasks_info:
+        period = cfg.ticks(info["period_sec"])
+        work = max(1, cfg.ticks(info["execution_time_sec"]))
+        deadline = info.get("deadline_sec")
+        deadline = cfg.ticks(info["period_sec"] if deadline is None else deadline)
+        params.append((completion_ticks(work, work_per_tick), period, deadline))
+    return params
+
+
+def demand(params, t):
+    # h(t): execution of all jobs with release and deadline inside [0, t]
+    return sum((t - d) // p * c + c for c, p, d in params if d <= t)
+
+
+def last_deadline_before(params, t):
+    # Largest absolute deadline strictly before t
+    latest = 0
+    for _, p, d in params:
+        if d < t:
+            latest = max(latest, d + (t - 1 - d) // p * p)
+    return latest
+
+
+def busy_period(params):
+    # Length of the synchronous busy period, the fixed point of w = sum ceil(w/T) C
+    w = sum(c for c, _, _ in params)
+    while True:
+        nxt = sum(-(-w // p) * c for c, p, _ in params)
+        if nxt == w:
+            return w
+        w = nxt
+
+
+def is_feasible_params(params):
+    if not params:
+        return True
+    utilization = sum(Fraction(c, p) for c, p, _ in params)
+    if utilization > 1:
+        return False
+    # Only deadlines before L need checking
+    limit = busy_period(params)
+    if utilization < 1:
+        la = sum((p - d) * Fraction(c, p) for c, p, d in params) / (1 - utilization)
+        limit = min(limit, max(max(d for _, _, d in params), math.ceil(la)))
+    d_min = min(d for _, _, d in params)
+
+    t = last_deadline_before(params, limit + 1)
+    h = demand(params, t)
+    while h <= t and h > d_min:
+        if h < t:
+            t = h
+        else:
+            t = last_deadline_before(params, t)
+        h = demand(params, t)
+    return h <= d_min
+
+
+def is_feasible(tasks_info, frequency, cfg=None):
+    # True when EDF meets every deadline of the task set at `frequency`
+    return is_feasible_params(task_parameters(tasks_info, frequency, cfg))
+
+
+def feasibility_by_frequency(tasks_info, cfg=None):
+    cfg = cfg or config.current()
+    return {f: is_feasible(tasks_info, f, cfg) for f in cfg.frequency_list}
+
+
+def minimum_feasible_frequency(tasks_info, cfg=None):
+    # Lowest operating point at which the set is EDF-feasible, or None.
+    # Feasibility only improves with frequency, so bisect the sorted table.
+    cfg = cfg or config.current()
+    frequencies = cfg.frequency_list
+    lo, hi = 0, len(frequencies)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if is_feasible(tasks_info, frequencies[mid], cfg):
+            hi = mid
+        else:
+            lo = mid + 1
+    if lo == len(frequencies):
+        return None
+    return frequencies[lo], cfg.power_list[lo]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="EDF feasibility of config.TASKS at each available frequency")
+    parser.parse_args()
+
+    cfg = config.current()
+    start = time.perf_counter()
+    feasible = feasibility_by_frequency(config.TASKS, cfg)
+    elapsed = time.perf_counter() - start
+    for f, ok in feasible.items():
+        print(f"{f} GHz ({cfg.power_of[f]} W): {'feasible' if ok else 'NOT feasible'}")
+    lowest = minimum_feasible_frequency(config.TASKS, cfg)
+    print(f"Minimum feasible frequency: {lowest[0] if lowest else 'none'} ({elapsed*1000:.2f} ms)")
@@ -0,0 +1,131 @@
+# batch.py
+
+import numpy as np
+
+import config
+from main import get_static_frequency
+
+# Job states, one per (task set, task) cell
+PENDING, READY, RUNNING, DEAD = 0, 1, 2, 3
+NEVER = np.iinfo(np.int64).max // 4
+
+
+def ticks_to_complete(remaining, work_per_tick):
+    # Vector form of Task.ticks_to_complete(), with the same rounding guards
+    ticks = np.maximum(1, np.ceil(remaining / work_per_tick)).astype(np.int64)
+    while True:
+        lower = (ticks > 1) & (remaining - (ticks - 1) * work_per_tick <= 0)
+        higher = remaining - ticks * work_per_tick > 0
+        if not (lower.any() or higher.any()):
+            return ticks
+        ticks = ticks - lower + higher
+
+
+def pack_task_sets(task_sets, cfg):
+    # Pads the task sets into (sets, max_tasks) arrays of ticks
+    rows, width = len(task_sets), max(len(tasks) for tasks in task_sets)
+    period = np.ones((rows, width), dtype=np.int64)
+    wcet = np.zeros((rows, width), dtype=np.int64)
+    deadline = np.ones((rows, width), dtype=np.int64)
+    valid = np.zeros((rows, width), dtype=bool)
+    for i, tasks in enumerate(task_sets):
+        for j, info in enumerate(tasks):
+            period[i, j] = cfg.ticks(info["period_sec"])
+            wcet[i, j] = cfg.ticks(info["execution_time_sec"])
+            d = info.get("deadline_sec")
+            deadline[i, j] = cfg.ticks(info["period_sec"] if d is None else d)
+            valid[i, j] = True
+    return period, wcet, deadline, valid
+
+
+def simulate_static_batch(task_sets, frequencies=None, powers=None, until=None, cfg=None):
+    # Simulates many independent task sets at fixed frequencies at once, one
+    # row per set. Each iteration advances every unfinished row to its own
+    # next event, with the same rules and tie-breaking (deadline, then task
+    # index) as engine.Simulation driving EDFScheduler, so energy, idle time
+    # and misses match run_schedule() for each set. Frequencies default to
+    # get_static_frequency() of each set. Returns three arrays: energy (J),
+    # idle time (s) and missed deadlines.
+    cfg = cfg or config.current()
+    if frequencies is None:
+        chosen = [get_static_frequency(tasks, cfg=cfg) for tasks in task_sets]
+        frequencies = [f for f, _ in chosen]
+        powers = [p for _, p in chosen]
+    until = cfg.duration_ticks if until is None else until
+
+    period, wcet, relative_deadline, valid = pack_task_sets(task_sets, cfg)
+    rows, width = period.shape
+    work = np.maximum(1, wcet).astype(np.float64)  # set_actual_execution_time() never goes below one tick
+    arrival = np.zeros((rows, width), dtype=np.int64)
+    deadline = relative_deadline.copy()
+    remaining = np.where(valid, work, 0.0)
+    state = np.where(valid, PENDING, DEAD).astype(np.int8)
+
+    work_per_tick = np.asarray(frequencies, dtype=np.float64) / cfg.max_frequency
+    power = np.asarray(powers, dtype=np.float64)
+    now = np.zeros(rows, dtype=np.int64)
+    running = np.full(rows, -1, dtype=np.int64)
+    busy = np.zeros(rows, dtype=np.int64)
+    idle = np.zeros(rows, dtype=np.int64)
+    missed = np.zeros(rows, dtype=np.int64)
+
+    # Rows still simulating; finished rows drop out of the working set
+    live = np.arange(rows)
+    while live.size:
+        a, d, r, s = arrival[live], deadline[live], remaining[live], state[live]
+        t, run, w = now[live], running[live], work_per_tick[live]
+        index = np.arange(live.size)
+        has_run = run >= 0
+        col = np.where(has_run, run, 0)
+
+        # handle_arrivals(): release due jobs, preempt on a strictly earlier deadline
+        arrive = (s == PENDING) & (a <= t[:, None])
+        s[arrive] = READY
+        run_deadline = np.where(has_run, d[index, col], NEVER)
+        preempt = has_run & (arrive & (d < run_deadline[:, None])).any(axis=1)
+        s[index[preempt], col[preempt]] = READY
+        run[preempt] = -1
+
+        # check_deadline_misses(): queued jobs whose deadline has passed are dropped
+        miss = (s == READY) & (d < t[:, None])
+        missed[live] += miss.sum(axis=1)
+        s[miss] = DEAD
+
+        # schedule(): earliest deadline, lowest index among ties
+        idle_rows = run < 0
+        ready_key = np.where(s == READY, d, NEVER)
+        pick = ready_key.argmin(axis=1)
+        start = idle_rows & (ready_key[index, pick] < NEVER)
+        run[start] = pick[start]
+        s[index[start], pick[start]] = RUNNING
+        has_run = run >= 0
+        col = np.where(has_run, run, 0)
+
+        # Next event: horizon, release, queued deadline expiry, completion
+        step = until - t
+        step = np.minimum(step, np.where(s == PENDING, a, NEVER).min(axis=1) - t)
+        step = np.minimum(step, np.where(s == READY, d, NEVER).min(axis=1) + 1 - t)
+        if has_run.any():
+            step[has_run] = np.minimum(step[has_run], ticks_to_complete(r[index[has_run], col[has_run]], w[has_run]))
+
+        busy[live] += np.where(has_run, step, 0)
+        idle[live] += np.where(has_run, 0, step)
+        t = t + step
+
+        # Task.execute() and complete_task() for the running jobs
+        rr, rc = index[has_run], col[has_run]
+        r[rr, rc] -= step[has_run] * w[has_run]
+        done = r[rr, rc] <= 0
+        dr, dc = rr[done], rc[done]
+        r[dr, dc] = work[live[dr], dc]
+        d[dr, dc] += period[live[dr], dc]
+        a[dr, dc] += period[live[dr], dc]
+        s[dr, dc] = PENDING
+        run[dr] = -1
+
+        arrival[live], deadline[live], remaining[live], state[live] = a, d, r, s
+        now[live], running[live] = t, run
+        live = live[t < until]
+
+    energy = (power * busy + cfg.idle_power * idle) * cfg.time_quantum
+    return energy, idle * cfg.time_quantum, missed
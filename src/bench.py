@@ -0,0 +1,228 @@
+# bench.py
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import config
+from edf import EDFScheduler, CC_EDFScheduler
+from engine import Simulation
+from main import init_tasks, build_schedule, build_cc_edf, build_la_edf
+from task import TaskTable
+
+
+def stress_config(time_quantum, duration_sec):
+    # The default settings with the bench's quantum and horizon
+    return config.SimulationConfig(time_quantum=time_quantum, duration_seconds=duration_sec)
+
+
+def stress_task_set(num_tasks, utilization, seed=0, min_period_sec=1, max_period_sec=100, cfg=None):
+    # num_tasks tasks sharing the utilization equally, with random periods,
+    # kept in a TaskTable rather than one dict per task
+    rng = random.Random(seed)
+    share = utilization / num_tasks
+    tasks = TaskTable(cfg)
+    for i in range(num_tasks):
+        period = round(rng.uniform(min_period_sec, max_period_sec), 1)
+        tasks.append(f"Task{i+1}", period * share, period)
+    return tasks
+
+
+def stress(num_tasks=10000, utilization=0.9, duration_sec=60, time_quantum=0.001, seed=0, algorithm="edf",
+           profiler=None):
+    cfg = stress_config(time_quantum, duration_sec)
+    tasks_info = stress_task_set(num_tasks, utilization, seed, cfg=cfg)
+
+    start = time.perf_counter()
+    if algorithm == "cc":
+        exec_range = cfg.cc_exec_range
+        scheduler = CC_EDFScheduler(cfg.frequency_list[0], cfg)
+        sim = Simulation(scheduler, init_tasks(tasks_info, cfg.max_frequency, cfg.max_power, exec_range, cfg=cfg),
+                         exec_range=exec_range)
+    else:
+        scheduler = EDFScheduler(cfg)
+        sim = Simulation(scheduler, init_tasks(tasks_info, cfg.max_frequency, cfg.max_power, cfg=cfg),
+                         cfg.max_frequency, cfg.max_power)
+    setup = time.perf_counter() - start
+    if profiler is not None:
+        profiler.attach(sim)
+
+    events = 0
+    start = time.perf_counter()
+    while scheduler.current_ticks < cfg.duration_ticks:
+        sim.step(cfg.duration_ticks)
+        events += 1
+    elapsed = time.perf_counter() - start
+
+    energy, idle, missed = sim.results()
+    print(f"Stress ({algorithm}): {num_tasks} tasks, U={utilization:.2f}, {duration_sec}s at {time_quantum}s quanta "
+          f"({cfg.duration_ticks} ticks)")
+    print(f"Setup: {setup:.3f}s, Simulation: {elapsed:.3f}s, Events: {events} "
+          f"({events/elapsed:.0f} events/s, {elapsed/events*1e6:.1f} us/event)")
+    print(f"Energy: {energy:.2f} J, Idle: {idle:.2f}s, Missed: {missed}")
+    if profiler is not None:
+        profiler.detach()
+        print(profiler.report())
+    return elapsed, events
+
+
+# ---- Scaling suite ----
+# Times each engine over a sweep of one parameter at a time around a base
+# case, and compares the numbers against a saved JSON baseline.
+
+def frequency_table(levels):
+    # `levels` operating points from 1.0 to 2.0 GHz with power growing
+    # roughly cubically, matching the default table at its ends
+    if levels == 1:
+        return ((2.0, 90),)
+    return tuple((round(1 + i / (levels - 1), 4), round(30 * (1 + i / (levels - 1)) ** 1.585, 2))
+                 for i in range(levels))
+
+
+# Engines under test: name -> (task table, cfg) -> Simulation. New engines
+# register here.
+ENGINES = {
+    "edf": lambda tasks, cfg: build_schedule(tasks, cfg.max_frequency, cfg.max_power, cfg=cfg),
+    "cc": lambda tasks, cfg: build_cc_edf(tasks, cfg.frequency_list[0], seed=0, cfg=cfg),
+    "la": lambda tasks, cfg: build_la_edf(tasks, seed=0, cfg=cfg),
+}
+# Look-ahead EDF visits every outstanding job per decision, which makes the
+# 10^4-task cases take minutes, so it only runs when asked for
+DEFAULT_ENGINES = ("edf", "cc")
+
+BASE_CASE = {"tasks": 1000, "duration": 120, "quantum": 0.001, "frequencies": 4, "utilization": 0.9}
+AXES = {
+    "tasks": [10, 100, 1000, 10000],
+    "duration": [30, 120, 600],
+    "quantum": [0.1, 0.01, 0.001],
+    "frequencies": [2, 4, 16, 64],
+    "utilization": [0.3, 0.6, 0.9],
+}
+FULL_AXES = dict(AXES, tasks=[10, 100, 1000, 10000, 100000], duration=[30, 120, 600, 3600])
+
+
+def completed_jobs(sim):
+    # Every completion moves its task's next release on by one period, and
+    # misses never do, so this counts the jobs run to completion
+    return sum(task.next_arrival_ticks // task.period_ticks for task in sim.tasks)
+
+
+def bench_case(engine, case, seed=0, repeat=1, memory=True):
+    cfg = config.SimulationConfig(time_quantum=case["quantum"], duration_seconds=case["duration"],
+                                  frequencies=frequency_table(case["frequencies"]))
+    tasks = stress_task_set(case["tasks"], case["utilization"], seed, cfg=cfg)
+    build = ENGINES[engine]
+
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        sim = build(tasks, cfg)
+        setup = time.perf_counter() - start
+        start = time.perf_counter()
+        sim.run(cfg.duration_ticks)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best[1]:
+            best = (setup, elapsed, completed_jobs(sim), sim.results()[2])
+    setup, elapsed, jobs, missed = best
+
+    peak = None
+    if memory:
+        # A separate run: tracemalloc slows allocation-heavy code down
+        tracemalloc.start()
+        build(tasks, cfg).run(cfg.duration_ticks)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    elapsed = max(elapsed, 1e-9)
+    return {"engine": engine, **case, "setup_s": setup, "run_s": elapsed, "jobs": jobs, "missed": missed,
+            "jobs_per_s": jobs / elapsed, "ticks_per_s": cfg.duration_ticks / elapsed, "peak_bytes": peak}
+
+
+def case_key(result, axis):
+    return f"{result['engine']}/{axis}={result[axis]}"
+
+
+def run_suite(engines=None, axes=AXES, seed=0, repeat=1, memory=True):
+    results = {}
+    for engine in engines or DEFAULT_ENGINES:
+        for axis, values in axes.items():
+            for value in values:
+                result = bench_case(engine, dict(BASE_CASE, **{axis: value}), seed, repeat, memory)
+                results[case_key(result, axis)] = result
+                peak = "-" if result["peak_bytes"] is None else f"{result['peak_bytes'] / 2**20:.1f} MiB"
+                print(f"{case_key(result, axis):<28}{result['run_s']:>9.3f}s {result['jobs_per_s']:>12.0f} jobs/s "
+                      f"{result['ticks_per_s']:>14.0f} ticks/s {peak:>11}")
+    return results
+
+
+def regressions(results, baseline, threshold=0.2):
+    # Cases whose throughput fell, or whose peak memory grew, by more than
+    # `threshold` relative to the baseline. Runs under 10 ms are timer noise
+    # and only their memory is compared.
+    flagged = []
+    for key, result in results.items():
+        old = baseline.get(key)
+        if old is None:
+            continue
+        if old["run_s"] >= 0.01 and result["jobs_per_s"] < old["jobs_per_s"] * (1 - threshold):
+            flagged.append(f"{key}: {result['jobs_per_s']:.0f} jobs/s, baseline {old['jobs_per_s']:.0f}")
+        if result["peak_bytes"] and old.get("peak_bytes") and result["peak_bytes"] > old["peak_bytes"] * (1 + threshold):
+            flagged.append(f"{key}: peak {result['peak_bytes']} bytes, baseline {old['peak_bytes']}")
+    return flagged
+
+
+def save_baseline(path, results):
+    with open(path, "w") as f:
+        json.dump({"python": platform.python_version(), "machine": platform.machine(), "results": results}, f, indent=1)
+
+
+def load_baseline(path):
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scheduler stress benchmark")
+    parser.add_argument("--tasks", type=int, default=10000)
+    parser.add_argument("--utilization", type=float, default=0.9)
+    parser.add_argument("--duration", type=float, default=60)
+    parser.add_argument("--quantum", type=float, default=0.001)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--algorithm", choices=["edf", "cc"], default="edf")
+    parser.add_argument("--profile", metavar="PREFIX",
+                        help="time the simulation phases and write PREFIX.json and PREFIX.folded")
+    parser.add_argument("--suite", action="store_true", help="run the scaling suite instead of one stress run")
+    parser.add_argument("--full", action="store_true", help="suite: extend the sweeps to 10^5 tasks and 3600 s")
+    parser.add_argument("--engines", nargs="+", choices=sorted(ENGINES), help="suite: engines to time")
+    parser.add_argument("--repeat", type=int, default=3, help="suite: best of this many timed runs per case")
+    parser.add_argument("--no-memory", action="store_true", help="suite: skip the tracemalloc runs")
+    parser.add_argument("--save", metavar="PATH", help="suite: write the results as a JSON baseline")
+    parser.add_argument("--baseline", metavar="PATH", help="suite: flag regressions against this baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="suite: relative change that counts as a regression")
+    args = parser.parse_args()
+
+    if args.suite:
+        results = run_suite(args.engines, FULL_AXES if args.full else AXES, args.seed, args.repeat,
+                            not args.no_memory)
+        if args.save:
+            save_baseline(args.save, results)
+        if args.baseline:
+            flagged = regressions(results, load_baseline(args.baseline), args.threshold)
+            for line in flagged:
+                print(f"REGRESSION {line}")
+            if flagged:
+                sys.exit(1)
+        sys.exit(0)
+
+    profiler = None
+    if args.profile:
+        from profiling import Profiler
+        profiler = Profiler()
+    stress(args.tasks, args.utilization, args.duration, args.quantum, args.seed, args.algorithm, profiler)
+    if profiler is not None:
+        profiler.save_json(args.profile + ".json")
+        profiler.save_folded(args.profile + ".folded")
@@ -0,0 +1,166 @@
+# cache.py
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+
+import config
+
+# Bump whenever a change to the simulator can change results, so stale
+# entries from older versions are never returned
+CACHE_VERSION = 4
+
+DEFAULT_DIRECTORY = os.path.join(os.path.expanduser("~"), ".cache", "edf-energy-aware-scheduling")
+
+
+def canonical_tasks(tasks_info):
+    # Task order and names do not identify a task set; sort by parameters.
+    # Cached runs simulate this order so that equal keys mean equal runs.
+    normalized = []
+    for info in tasks_info:
+        task = {"name": info["name"], "execution_time_sec": float(info["execution_time_sec"]),
+                "period_sec": float(info["period_sec"])}
+        if info.get("deadline_sec") is not None:
+            task["deadline_sec"] = float(info["deadline_sec"])
+        normalized.append(task)
+    normalized.sort(key=lambda t: (t["period_sec"], t.get("deadline_sec", t["period_sec"]),
+                                   t["execution_time_sec"], t["name"]))
+    return normalized
+
+
+def result_key(algorithm, tasks_info, seed=None, cfg=None, **params):
+    # Content hash of everything a run's result depends on: the normalized
+    # task set, the energy model, the simulation parameters and the seed
+    cfg = cfg or config.current()
+    description = {
+        "version": CACHE_VERSION,
+        "algorithm": algorithm,
+        "tasks": [[t["execution_time_sec"], t["period_sec"], t.get("deadline_sec")]
+                  for t in canonical_tasks(tasks_info)],
+        "frequencies": cfg.frequencies,
+        "idle_power": cfg.idle_power,
+        "time_quantum": cfg.time_quantum,
+        "duration_ticks": cfg.duration_ticks,
+        "cc_range": cfg.cc_exec_range,
+        "seed": seed,
+        "params": params,
+    }
+    encoded = json.dumps(description, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def trace_key(algorithm, tasks_info, seed=None, cfg=None, **params):
+    # For cached schedules rather than results: a trace labels its rows
+    # with task names, so the names in simulated order are part of the key
+    names = [t["name"] for t in canonical_tasks(tasks_info)]
+    return result_key(algorithm, tasks_info, seed, cfg, names=names, **params)
+
+
+class ResultCache:
+    # Two tiers: an in-memory LRU of decoded values in front of a directory
+    # of JSON files. The directory is kept under max_disk_bytes by deleting
+    # the least recently used files (reads refresh a file's mtime).
+
+    def __init__(self, directory=DEFAULT_DIRECTORY, memory_entries=256, max_disk_bytes=64 * 1024 * 1024):
+        self.memory = OrderedDict()
+        self.memory_entries = memory_entries
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = 0
+        self.misses = 0
+        self.disk_bytes = None  # measured lazily on the first write
+
+    def path(self, key):
+        return os.path.join(self.directory, key + ".json")
+
+    def get(self, key):
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            self.hits += 1
+            return self.memory[key]
+        if self.directory:
+            try:
+                with open(self.path(key)) as f:
+                    value = json.load(f)
+                os.utime(self.path(key))
+            except (OSError, ValueError):
+                value = None
+            if value is not None:
+                self.remember(key, value)
+                self.hits += 1
+                return value
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        self.remember(key, value)
+        if not self.directory:
+            return
+        data = json.dumps(value, separators=(",", ":"))
+        if len(data) > self.max_disk_bytes:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        if self.disk_bytes is None:
+            self.disk_bytes = sum(size for _, size, _ in self.disk_entries())
+        tmp = self.path(key) + ".tmp"
+        with open(tmp, "w") as f:
+            f.write(data)
+        os.replace(tmp, self.path(key))
+        self.disk_bytes += len(data)
+        if self.disk_bytes > self.max_disk_bytes:
+            self.evict()
+
+    def remember(self, key, value):
+        self.memory[key] = value
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_entries:
+            self.memory.popitem(last=False)
+
+    def disk_entries(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                try:
+                    stat = os.stat(os.path.join(self.directory, name))
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, name))
+        return entries
+
+    def evict(self):
+        entries = sorted(self.disk_entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in entries:
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            total -= size
+        self.disk_bytes = total
+
+    def get_or_compute(self, key, compute):
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        self.memory.clear()
+        if self.directory and os.path.isdir(self.directory):
+            for _, _, name in self.disk_entries():
+                os.remove(os.path.join(self.directory, name))
+        self.disk_bytes = 0
+
+
+_default_cache = None
+
+
+def default_cache():
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ResultCache()
+    return _default_cache
@@ -0,0 +1,121 @@
+# checkpoint.py
+
+import argparse
+import pickle
+import random
+import zlib
+
+import config
+from tracing import NULL_SINK
+
+# Snapshots of a running Simulation: scheduler queues, the running job,
+# every task's state, the energy accumulators, the execution time
+# generators and the global random state, pickled and zlib-compressed.
+# Resuming a snapshot and running on gives exactly the results of the
+# uninterrupted run, and one snapshot can be forked into several variants.
+#
+# Trace sinks are not part of a snapshot (a sink may hold an open file);
+# pass one to restore() to trace the resumed run. Detach any profiler
+# before taking a snapshot.
+
+MAGIC = b"EDFC"
+VERSION = 1
+
+
+def snapshot(simulation, level=6):
+    trace = simulation.trace
+    simulation.trace = simulation.scheduler.trace = NULL_SINK
+    try:
+        state = {"simulation": simulation, "random_state": random.getstate()}
+        data = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+    finally:
+        simulation.trace = simulation.scheduler.trace = trace
+    return MAGIC + VERSION.to_bytes(2, "little") + zlib.compress(data, level)
+
+
+def restore(data, trace=None, restore_random=True):
+    # restore_random puts back the global random state, which unseeded
+    # CC-EDF runs draw from; seeded runs carry their own generator
+    if data[:4] != MAGIC or int.from_bytes(data[4:6], "little") != VERSION:
+        raise ValueError(f"Not a version {VERSION} simulation checkpoint")
+    state = pickle.loads(zlib.decompress(data[6:]))
+    simulation = state["simulation"]
+    if restore_random:
+        random.setstate(state["random_state"])
+    if trace is not None:
+        simulation.trace = simulation.scheduler.trace = trace
+    return simulation
+
+
+def save(simulation, path, level=6):
+    data = snapshot(simulation, level)
+    with open(path, "wb") as f:
+        f.write(data)
+    return len(data)
+
+
+def load(path, trace=None, restore_random=True):
+    # Only load checkpoints you wrote: unpickling runs code from the file
+    with open(path, "rb") as f:
+        return restore(f.read(), trace, restore_random)
+
+
+def reconfigure(simulation, cfg, frequency=None, power=None):
+    # Switches a simulation to another config from its current tick on,
+    # e.g. a different frequency table or idle power. Remaining work is
+    # kept in max-frequency ticks, so the max frequency should not change.
+    # Fixed-frequency runs keep their frequency unless one is given.
+    simulation.cfg = simulation.scheduler.cfg = cfg
+    for task in simulation.tasks:
+        task.cfg = cfg
+    scheduler = simulation.scheduler
+    if hasattr(scheduler, "frequencies"):
+        scheduler.frequencies = cfg.frequency_list
+        scheduler.powers = cfg.power_list
+    if frequency is not None:
+        simulation.frequency = frequency
+        simulation.power = cfg.power_of[frequency] if power is None else power
+    return simulation
+
+
+def fork(simulation, variants=1, trace=None):
+    # Independent copies of the simulation as it stands now
+    data = snapshot(simulation, level=1)
+    return [restore(data, trace, restore_random=False) for _ in range(variants)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Checkpoint a simulation of config.TASKS, or resume one")
+    parser.add_argument("path")
+    parser.add_argument("--resume", action="store_true", help="continue the run saved in PATH")
+    parser.add_argument("--algorithm", choices=["edf", "static", "cc", "la"], default="cc")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--at", type=float, default=None, help="seconds to simulate before saving (default: half)")
+    parser.add_argument("--until", type=float, default=None, help="seconds to run to when resuming (default: all)")
+    args = parser.parse_args()
+
+    if args.resume:
+        sim = load(args.path)
+        until = sim.cfg.duration_ticks if args.until is None else sim.cfg.ticks(args.until)
+        start = sim.scheduler.current_ticks
+        sim.run(until)
+        energy, idle, missed = sim.results()
+        print(f"Resumed at {start / sim.cfg.ticks_per_second:.1f}s, ran to {until / sim.cfg.ticks_per_second:.1f}s")
+        print(f"Energy: {energy:.2f} J, Idle: {idle:.2f}s, Missed: {missed}")
+    else:
+        from main import (build_schedule, build_cc_edf, build_la_edf, calculate_utilization, cc_safe_frequency,
+                          get_static_frequency)
+        cfg = config.current()
+        if args.algorithm == "cc":
+            sim = build_cc_edf(config.TASKS, cc_safe_frequency(calculate_utilization(config.TASKS), cfg),
+                               seed=args.seed, cfg=cfg)
+        elif args.algorithm == "la":
+            sim = build_la_edf(config.TASKS, seed=args.seed, cfg=cfg)
+        elif args.algorithm == "static":
+            sim = build_schedule(config.TASKS, *get_static_frequency(config.TASKS, cfg=cfg), cfg=cfg)
+        else:
+            sim = build_schedule(config.TASKS, cfg.max_frequency, cfg.max_power, cfg=cfg)
+        at = cfg.duration_ticks // 2 if args.at is None else cfg.ticks(args.at)
+        sim.run(at)
+        size = save(sim, args.path)
+        print(f"Saved the run at {at / cfg.ticks_per_second:.1f}s to {args.path} ({size} bytes)")
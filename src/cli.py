@@ -0,0 +1,208 @@
+# cli.py
+
+import argparse
+import contextlib
+import csv
+import json
+import os
+import sys
+
+# Headless entry point for scripts and pipelines: task sets and frequency
+# tables come from files, results go to stdout or a file as JSON or CSV
+# (or to a Parquet or Arrow file, through export.py).
+# Only the standard library is imported up front; the simulator modules
+# are imported once the arguments are known, and nothing here touches the
+# GUI.
+
+ALGORITHMS = ("edf", "static", "cc", "la")
+RESULT_FIELDS = ("algorithm", "tasks", "utilization", "frequency", "power", "energy", "idle", "missed")
+
+
+def read_records(path):
+    # Rows of a JSON or CSV file (by extension; "-" reads JSON from stdin).
+    # JSON may also be an object holding the rows under "tasks" or "frequencies".
+    if path == "-":
+        return json.load(sys.stdin)
+    with open(path, newline="") as f:
+        if os.path.splitext(path)[1].lower() == ".csv":
+            return list(csv.DictReader(f))
+        return json.load(f)
+
+
+def load_tasks(path):
+    data = read_records(path)
+    if isinstance(data, dict):
+        data = data["tasks"]
+    tasks = []
+    for i, row in enumerate(data):
+        task = {"name": row.get("name") or f"Task{i + 1}",
+                "execution_time_sec": float(row["execution_time_sec"]),
+                "period_sec": float(row["period_sec"])}
+        if row.get("deadline_sec") not in (None, ""):
+            task["deadline_sec"] = float(row["deadline_sec"])
+        for key in ("execution_time_sec", "period_sec", "deadline_sec"):
+            if key in task and not 0 < task[key] < float("inf"):
+                raise ValueError(f"{task['name']}: {key} must be positive")
+        tasks.append(task)
+    if not tasks:
+        raise ValueError(f"{path} has no tasks")
+    return tasks
+
+
+def load_frequencies(path):
+    # {"GHz": W, ...}, [[GHz, W], ...] or rows with frequency and power
+    data = read_records(path)
+    if isinstance(data, dict):
+        data = data.get("frequencies", data)
+    if isinstance(data, dict):
+        return tuple((float(f), float(p)) for f, p in data.items())
+    table = []
+    for row in data:
+        if isinstance(row, dict):
+            table.append((float(row["frequency"]), float(row["power"])))
+        else:
+            table.append((float(row[0]), float(row[1])))
+    return tuple(table)
+
+
+def simulate(tasks, algorithm, cfg, seed=None, exact=False, cache=None, trace=None):
+    from main import (calculate_utilization, get_static_frequency, run_cached, run_schedule, run_cc_edf,
+                      run_la_edf, cc_safe_frequency)
+    utilization = calculate_utilization(tasks)
+    if trace is not None:
+        cache = None
+    if algorithm == "la":
+        frequency = power = None
+        if seed is None:
+            cache = None
+        energy, idle, missed = run_cached(cache, "LA-EDF", tasks, lambda t: run_la_edf(t, trace, seed=seed, cfg=cfg),
+                                          seed, cfg)
+    elif algorithm == "cc":
+        frequency = safe = cc_safe_frequency(utilization, cfg)
+        power = None
+        if seed is None:
+            cache = None
+        energy, idle, missed = run_cached(cache, "CC-EDF", tasks,
+                                          lambda t: run_cc_edf(t, safe, trace, seed=seed, cfg=cfg),
+                                          seed, cfg, safe_frequency=safe)
+    else:
+        if algorithm == "static":
+            frequency, power = get_static_frequency(tasks, exact, cfg)
+        else:
+            frequency, power = cfg.max_frequency, cfg.max_power
+        energy, idle, missed = run_cached(cache, "EDF", tasks, lambda t: run_schedule(t, frequency, power, trace, cfg),
+                                          cfg=cfg, frequency=frequency, power=power)
+    return {"algorithm": algorithm, "tasks": len(tasks), "utilization": utilization, "frequency": frequency,
+            "power": power, "energy": energy, "idle": idle, "missed": missed}
+
+
+def write_results(results, out, fmt):
+    if fmt in ("parquet", "arrow"):
+        from export import SUMMARY_SCHEMA, export_rows
+        export_rows(out, SUMMARY_SCHEMA, results, fmt)
+    elif fmt == "csv":
+        writer = csv.DictWriter(out, RESULT_FIELDS, lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(results)
+    else:
+        json.dump(results, out, indent=2)
+        out.write("\n")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Run EDF, static EDF, CC-EDF and look-ahead EDF on a task set file "
+                                                 "without the GUI")
+    parser.add_argument("tasks", help="task set as JSON or CSV (name, execution_time_sec, period_sec[, deadline_sec])")
+    parser.add_argument("--frequencies", help="frequency table as JSON or CSV (frequency, power); default config's")
+    parser.add_argument("-a", "--algorithms", nargs="+", choices=ALGORITHMS, default=list(ALGORITHMS))
+    parser.add_argument("--duration", type=float, help="simulated seconds")
+    parser.add_argument("--quantum", type=float, help="seconds per tick")
+    parser.add_argument("--idle-power", type=float)
+    parser.add_argument("--seed", type=int, help="seed for CC-EDF's and LA-EDF's execution times")
+    parser.add_argument("--exact", action="store_true", help="pick the static frequency by demand analysis")
+    parser.add_argument("--cache", action="store_true", help="reuse results of earlier identical runs")
+    parser.add_argument("-f", "--format", choices=["json", "csv", "parquet", "arrow"], default="json",
+                        help="parquet and arrow need pyarrow and --output")
+    parser.add_argument("-o", "--output", help="write results here instead of stdout")
+    parser.add_argument("--segments", metavar="PATH",
+                        help="also write every run's schedule segments to PATH (.csv, .parquet or .arrow)")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.format in ("parquet", "arrow") and not args.output:
+        parser.error(f"--format {args.format} needs --output")
+    if args.format in ("parquet", "arrow"):
+        from export import require_pyarrow
+        try:
+            require_pyarrow()
+        except ImportError as e:
+            print(f"cli: {e}", file=sys.stderr)
+            return 2
+    try:
+        tasks = load_tasks(args.tasks)
+        frequencies = load_frequencies(args.frequencies) if args.frequencies else None
+    except (OSError, ValueError, KeyError, IndexError, TypeError) as e:
+        print(f"cli: cannot read input: {e}", file=sys.stderr)
+        return 2
+
+    import dataclasses
+    import config
+    cfg = config.current()
+    overrides = {name: value for name, value in (("duration_seconds", args.duration), ("time_quantum", args.quantum),
+                                                 ("frequencies", frequencies), ("idle_power", args.idle_power),
+                                                 ("random_seed", args.seed)) if value is not None}
+    try:
+        if args.quantum is not None and not 0 < args.quantum <= 1:
+            raise ValueError("--quantum must be more than 0 and at most 1 second")
+        if args.duration is not None and not args.duration > 0:
+            raise ValueError("--duration must be positive")
+        cfg = dataclasses.replace(cfg, **overrides)
+        if cfg.duration_ticks < 1:
+            raise ValueError("--duration must be at least one time quantum")
+        for task in tasks:
+            if any(cfg.ticks(task[key]) < 1 for key in ("execution_time_sec", "period_sec", "deadline_sec")
+                   if key in task):
+                raise ValueError(f"{task['name']}: times must be at least one time quantum")
+    except (ValueError, ZeroDivisionError) as e:
+        print(f"cli: invalid settings: {e}", file=sys.stderr)
+        return 2
+    cache = None
+    if args.cache:
+        from cache import default_cache
+        cache = default_cache()
+
+    segments = None
+    if args.segments:
+        from export import SEGMENT_SCHEMA, ColumnarWriter, SegmentSink
+        try:
+            segments = ColumnarWriter(args.segments, SEGMENT_SCHEMA)
+        except (OSError, ValueError, ImportError) as e:
+            print(f"cli: cannot write segments: {e}", file=sys.stderr)
+            return 2
+
+    # The simulator reports some choices with print(); keep stdout clean for the results
+    results = []
+    with contextlib.redirect_stdout(sys.stderr):
+        for algorithm in args.algorithms:
+            trace = SegmentSink(segments, algorithm, cfg) if segments is not None else None
+            results.append(simulate(tasks, algorithm, cfg, cfg.random_seed, args.exact, cache, trace))
+            if trace is not None:
+                trace.close()
+    if segments is not None:
+        segments.close()
+
+    if args.format in ("parquet", "arrow"):
+        write_results(results, args.output, args.format)
+    elif args.output:
+        with open(args.output, "w", newline="") as out:
+            write_results(results, out, args.format)
+    else:
+        write_results(results, sys.stdout, args.format)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
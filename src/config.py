@@ -1,5 +1,8 @@
 # config.py
 
+from dataclasses import dataclass, field
+from types import MappingProxyType
+
 TIME_QUANTUM = 0.1
 TICKS_PER_SECOND = int(round(1 / TIME_QUANTUM))  # e.g., 0.1 -> 10 ticks/sec
 SIMULATION_DURATION_SECONDS = 100
@@ -24,5 +27,75 @@ CC_EDF_EXECUTION_TIME_RANGE = {
     "max_percent": 80,
 }
 
+# Seed for CC-EDF's execution time draws; None keeps them unseeded.
+# Only seeded CC-EDF runs are reproducible, so only those are cached.
+RANDOM_SEED = None
+
 MAX_FREQUENCY = max(AVAILABLE_FREQUENCIES.keys())
 MAX_POWER = AVAILABLE_FREQUENCIES[MAX_FREQUENCY]
+
+
+@dataclass(frozen=True)
+class SimulationConfig:
+    # One run's settings, fixed for its lifetime. Everything that reads
+    # settings takes one of these; simulations holding different configs can
+    # run side by side in one process. The module globals above stay as the
+    # defaults that current() snapshots.
+    time_quantum: float = TIME_QUANTUM
+    duration_seconds: float = SIMULATION_DURATION_SECONDS
+    frequencies: tuple = tuple(sorted(AVAILABLE_FREQUENCIES.items()))  # (GHz, W) pairs
+    idle_power: float = IDLE_POWER
+    cc_exec_range: tuple = (CC_EDF_EXECUTION_TIME_RANGE["min_percent"], CC_EDF_EXECUTION_TIME_RANGE["max_percent"])
+    random_seed: object = RANDOM_SEED
+
+    # Derived once in __post_init__
+    ticks_per_second: int = field(init=False)
+    duration_ticks: int = field(init=False)
+    frequency_list: tuple = field(init=False)  # ascending
+    power_list: tuple = field(init=False)
+    power_of: MappingProxyType = field(init=False, compare=False)
+    max_frequency: float = field(init=False)
+    max_power: float = field(init=False)
+
+    def __post_init__(self):
+        frequencies = tuple(sorted((float(f), p) for f, p in dict(self.frequencies).items()))
+        if not frequencies:
+            raise ValueError("SimulationConfig needs at least one frequency")
+        derived = {
+            "frequencies": frequencies,
+            "cc_exec_range": tuple(self.cc_exec_range),
+            "ticks_per_second": int(round(1 / self.time_quantum)),
+            "frequency_list": tuple(f for f, _ in frequencies),
+            "power_list": tuple(p for _, p in frequencies),
+            "power_of": MappingProxyType(dict(frequencies)),
+            "max_frequency": frequencies[-1][0],
+            "max_power": frequencies[-1][1],
+        }
+        derived["duration_ticks"] = int(self.duration_seconds * derived["ticks_per_second"])
+        for name, value in derived.items():
+            object.__setattr__(self, name, value)
+
+    def __getstate__(self):
+        # Pickle only the inputs (the mapping proxy cannot be pickled)
+        return {name: getattr(self, name) for name in
+                ("time_quantum", "duration_seconds", "frequencies", "idle_power", "cc_exec_range", "random_seed")}
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+        self.__post_init__()
+
+    def ticks(self, seconds):
+        return int(round(seconds * self.ticks_per_second))
+
+
+def current():
+    # Snapshot of the module-level settings, e.g. after the GUI changed them
+    return SimulationConfig(
+        time_quantum=TIME_QUANTUM,
+        duration_seconds=SIMULATION_DURATION_SECONDS,
+        frequencies=tuple(AVAILABLE_FREQUENCIES.items()),
+        idle_power=IDLE_POWER,
+        cc_exec_range=(CC_EDF_EXECUTION_TIME_RANGE["min_percent"], CC_EDF_EXECUTION_TIME_RANGE["max_percent"]),
+        random_seed=RANDOM_SEED,
+    )
@@ -1,88 +1,261 @@
 # edf.py
 
+import bisect
 import heapq
 import config
+from tracing import NULL_SINK, Release, Preempt, Miss, Completion
 
 class EDFScheduler:
-    def __init__(self):
+    # Both queues are heaps of (time, task_id) ints: pending_tasks is ordered
+    # by next arrival and ready_queue by absolute deadline, so releases and
+    # expired jobs are always found at the top. task_id breaks ties, so heap
+    # comparisons never reach Task objects; tasks[task_id] maps ids back to them.
+    def __init__(self, cfg=None):
+        self.cfg = cfg or config.current()
+        self.tasks = []
         self.ready_queue = []
         self.current_ticks = 0
         self.pending_tasks = []
         self.currently_running_task = None
         self.missed_deadlines = 0
+        self.trace = NULL_SINK
 
     def add_task(self, task):
-        heapq.heappush(self.ready_queue, (task.deadline_ticks, task))
+        heapq.heappush(self.ready_queue, (task.deadline_ticks, task.task_id))
 
     def add_periodic_task(self, task):
-        self.pending_tasks.append(task)
+        tasks, task_id = self.tasks, task.task_id
+        if task_id >= len(tasks):
+            tasks.extend([None] * (task_id + 1 - len(tasks)))
+        if tasks[task_id] is None:
+            tasks[task_id] = task
+        elif tasks[task_id] is not task:
+            raise ValueError(f"Duplicate task_id {task_id} for {task.name}")
+        heapq.heappush(self.pending_tasks, (task.next_arrival_ticks, task.task_id))
 
     def handle_arrivals(self):
-        arrived = [t for t in self.pending_tasks if t.next_arrival_ticks <= self.current_ticks]
-        for task in arrived:
-            print(f"Task {task.name} arrived at {self.current_ticks/config.TICKS_PER_SECOND:.1f}s with deadline {task.deadline_ticks/config.TICKS_PER_SECOND:.1f}s.")
+        while self.pending_tasks and self.pending_tasks[0][0] <= self.current_ticks:
+            task = self.tasks[heapq.heappop(self.pending_tasks)[1]]
+            if self.trace.enabled:
+                self.trace.emit(Release(self.current_ticks, task, task.deadline_ticks))
+            self.on_release(task)
             self.add_task(task)
-            self.pending_tasks.remove(task)
             # Preempt if needed
             if self.currently_running_task and task.deadline_ticks < self.currently_running_task.deadline_ticks:
-                print(f"Preempting {self.currently_running_task.name} for {task.name}.")
+                if self.trace.enabled:
+                    self.trace.emit(Preempt(self.current_ticks, self.currently_running_task, task))
                 self.add_task(self.currently_running_task)
                 self.currently_running_task = None
 
     def check_deadline_misses(self):
-        missed = []
-        for deadline, task in self.ready_queue:
-            if deadline < self.current_ticks:
-                print(f"Task {task.name} missed its deadline!")
-                self.missed_deadlines += 1
-                missed.append((deadline, task))
-        for m in missed:
-            self.ready_queue.remove(m)
-        heapq.heapify(self.ready_queue)
+        # Expired jobs have the earliest deadlines, so they sit at the top of the heap
+        while self.ready_queue and self.ready_queue[0][0] < self.current_ticks:
+            task = self.tasks[heapq.heappop(self.ready_queue)[1]]
+            if self.trace.enabled:
+                self.trace.emit(Miss(self.current_ticks, task, task.deadline_ticks))
+            self.missed_deadlines += 1
+            self.on_miss(task)
+
+    def complete_task(self, task, min_percent=100, max_percent=100):
+        # The running job finished: queue the task's next job
+        self.on_completion(task)
+        task.reset(min_percent, max_percent)
+        if self.trace.enabled:
+            self.trace.emit(Completion(self.current_ticks, task, task.deadline_ticks, task.actual_execution_ticks))
+        self.add_periodic_task(task)
+        self.currently_running_task = None
+
+    # Hooks for schedulers that track per-job state
+    def on_release(self, task):
+        pass
+
+    def on_completion(self, task):
+        pass
+
+    def on_miss(self, task):
+        pass
+
+    def next_arrival_ticks(self):
+        return self.pending_tasks[0][0] if self.pending_tasks else None
+
+    def earliest_deadline_ticks(self):
+        return self.ready_queue[0][0] if self.ready_queue else None
 
     def schedule(self):
         if not self.ready_queue:
             return None
-        _, task = heapq.heappop(self.ready_queue)
-        return task
+        return self.tasks[heapq.heappop(self.ready_queue)[1]]
 
     def advance_time(self, ticks):
         self.current_ticks += ticks
 
 
 class CC_EDFScheduler(EDFScheduler):
-    def __init__(self, safe_frequency):
-        super().__init__()
+    # Cycle-conserving EDF: each task contributes WCET/period to the total
+    # utilization while its job is outstanding and actual/period once it has
+    # completed. Both updates are O(1), and the frequency is the lowest
+    # operating point covering the total, found by bisection.
+    def __init__(self, safe_frequency, cfg=None):
+        super().__init__(cfg)
         self.slack_observed = False
         self.safe_frequency = safe_frequency  # never go below this frequency after slack
+        self.frequencies = self.cfg.frequency_list
+        self.powers = self.cfg.power_list
+        self.task_utilization = {}  # task_id -> utilization of its latest job
+        self.total_utilization = 0
 
-    def adjust_frequency(self):
-        tasks_considered = [t for (_, t) in self.ready_queue]
-        if self.currently_running_task:
-            tasks_considered.append(self.currently_running_task)
+    def set_utilization(self, task, work_ticks):
+        utilization = work_ticks / task.period_ticks
+        self.total_utilization += utilization - self.task_utilization.get(task.task_id, 0)
+        self.task_utilization[task.task_id] = utilization
+
+    def on_release(self, task):
+        self.set_utilization(task, task.worst_case_execution_ticks)
 
-        if not tasks_considered:
-            return min(config.AVAILABLE_FREQUENCIES.keys()), config.IDLE_POWER
+    def on_completion(self, task):
+        if task.actual_execution_ticks < task.worst_case_execution_ticks:
+            self.slack_observed = True
+        self.set_utilization(task, task.actual_execution_ticks)
 
-        D_min = min(t.deadline_ticks for t in tasks_considered)
-        time_until_deadline = D_min - self.current_ticks
-        if time_until_deadline <= 0:
-            return config.MAX_FREQUENCY, config.AVAILABLE_FREQUENCIES[config.MAX_FREQUENCY]
+    def on_miss(self, task):
+        # A missed job is dropped and its task never released again
+        self.set_utilization(task, 0)
 
-        tasks_for_Dmin = [t for t in tasks_considered if t.deadline_ticks == D_min]
-        total_work = sum(t.remaining_ticks for t in tasks_for_Dmin)
+    def adjust_frequency(self):
+        running = self.currently_running_task
+        cfg = self.cfg
+        if not running and not self.ready_queue:
+            return self.frequencies[0], cfg.idle_power
+
+        D_min = self.ready_queue[0][0] if self.ready_queue else running.deadline_ticks
+        if running:
+            D_min = min(D_min, running.deadline_ticks)
+        if D_min <= self.current_ticks:
+            return cfg.max_frequency, cfg.max_power
 
         if not self.slack_observed:
             # No slack yet: run at max frequency
-            return config.MAX_FREQUENCY, config.AVAILABLE_FREQUENCIES[config.MAX_FREQUENCY]
+            return cfg.max_frequency, cfg.max_power
+
+        return self.select_frequency(self.total_utilization)
 
-        # With slack observed, try to reduce frequency, but not below safe_frequency
-        frequency_fraction = total_work / time_until_deadline
-        # Must not go below safe_frequency
-        frequency_fraction = max(frequency_fraction, self.safe_frequency)
+    def select_frequency(self, utilization):
+        # Must not go below safe_frequency. The small tolerance absorbs the
+        # rounding drift of the running total at exact operating points.
+        required = max(utilization * self.cfg.max_frequency, self.safe_frequency)
+        i = bisect.bisect_left(self.frequencies, required - 1e-9)
+        if i == len(self.frequencies):
+            return self.cfg.max_frequency, self.cfg.max_power
+        return self.frequencies[i], self.powers[i]
 
-        for f in sorted(config.AVAILABLE_FREQUENCIES.keys()):
-            if f >= frequency_fraction:
-                return f, config.AVAILABLE_FREQUENCIES[f]
 
-        return config.MAX_FREQUENCY, config.AVAILABLE_FREQUENCIES[config.MAX_FREQUENCY]
+class LA_EDFScheduler(EDFScheduler):
+    # Look-ahead EDF (Pillai & Shin, 2001). Instead of waiting for slack,
+    # it defers as much outstanding work as the later deadlines allow and
+    # runs just fast enough to finish the rest by the earliest deadline.
+    # Only worst-case remaining work is used: actual execution times are
+    # not known before a job completes.
+    #
+    # The deferral pass walks tasks in reverse deadline order, but a task
+    # with no work left only takes its utilization out of the running
+    # total. Tasks whose deadline has passed do that after every job has
+    # been visited, so they need no visit: the pass covers the released
+    # jobs (ready or running) and the early completions whose deadlines are
+    # still ahead. These are kept in one list sorted by deadline, updated
+    # by bisection on release, completion and miss, so a decision walks the
+    # k entries once and never sorts: O(k). The recurrence clamps at every
+    # job, so it cannot be summarized in a tree.
+    def __init__(self, cfg=None):
+        super().__init__(cfg)
+        self.frequencies = self.cfg.frequency_list
+        self.powers = self.cfg.power_list
+        self.utilization = []  # task_id -> WCET/period
+        self.total_utilization = 0  # of every task still released
+        # Ascending (deadline, task_id) of released jobs and (deadline,
+        # ~task_id) of jobs finished before their deadline
+        self.by_deadline = []
+
+    def add_periodic_task(self, task):
+        task_id = task.task_id
+        if task_id >= len(self.tasks) or self.tasks[task_id] is None:
+            utilization = task.worst_case_execution_ticks / task.period_ticks
+            if task_id >= len(self.utilization):
+                self.utilization.extend([0.0] * (task_id + 1 - len(self.utilization)))
+            self.utilization[task_id] = utilization
+            self.total_utilization += utilization
+        super().add_periodic_task(task)
+
+    def on_release(self, task):
+        bisect.insort(self.by_deadline, (task.deadline_ticks, task.task_id))
+
+    def forget(self, task):
+        by_deadline = self.by_deadline
+        del by_deadline[bisect.bisect_left(by_deadline, (task.deadline_ticks, task.task_id))]
+
+    def on_completion(self, task):
+        # Called before reset(), so deadline_ticks is still this job's
+        # deadline. Ids are stored complemented (negative) to tell these
+        # entries from released jobs in the deferral pass.
+        self.forget(task)
+        if task.deadline_ticks > self.current_ticks:
+            bisect.insort(self.by_deadline, (task.deadline_ticks, ~task.task_id))
+
+    def on_miss(self, task):
+        # A missed job is dropped and its task never released again
+        self.forget(task)
+        self.total_utilization -= self.utilization[task.task_id]
+
+    def deferred_work(self):
+        # Work that must run before the earliest deadline, in max-frequency
+        # ticks, and that deadline
+        now = self.current_ticks
+        by_deadline = self.by_deadline
+        # Completions whose deadline has passed sort ahead of every released
+        # job still in the list (those are due now at the earliest)
+        expired = 0
+        while expired < len(by_deadline) and by_deadline[expired][0] <= now and by_deadline[expired][1] < 0:
+            expired += 1
+        if expired:
+            del by_deadline[:expired]
+
+        tasks, utilizations = self.tasks, self.utilization
+        running = self.currently_running_task
+        earliest = self.ready_queue[0][0] if self.ready_queue else running.deadline_ticks
+        if running:
+            earliest = min(earliest, running.deadline_ticks)
+
+        utilization = self.total_utilization
+        must_run = 0.0
+        for deadline, task_id in reversed(by_deadline):
+            if task_id < 0:
+                utilization -= utilizations[~task_id]
+                continue
+            utilization -= utilizations[task_id]
+            task = tasks[task_id]
+            # Worst-case work left: the scheduler cannot know the actual execution time
+            left = task.worst_case_execution_ticks - task.actual_execution_ticks + task.remaining_ticks
+            window = deadline - earliest
+            if window:
+                room = (1 - utilization) * window
+                if room > 0:
+                    deferred = left if left < room else room
+                    utilization += deferred / window
+                    left -= deferred
+            must_run += left
+        return must_run, earliest
+
+    def adjust_frequency(self):
+        cfg = self.cfg
+        if not self.currently_running_task and not self.ready_queue:
+            return self.frequencies[0], cfg.idle_power
+        must_run, earliest = self.deferred_work()
+        if earliest <= self.current_ticks:
+            return cfg.max_frequency, cfg.max_power
+        return self.select_frequency(must_run / (earliest - self.current_ticks))
+
+    def select_frequency(self, utilization):
+        # Lowest operating point covering `utilization` of the max frequency
+        i = bisect.bisect_left(self.frequencies, utilization * self.cfg.max_frequency - 1e-9)
+        if i == len(self.frequencies):
+            return self.cfg.max_frequency, self.cfg.max_power
+        return self.frequencies[i], self.powers[i]
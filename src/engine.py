@@ -0,0 +1,167 @@
+# engine.py
+
+from tracing import NULL_SINK, BufferSink, Run, Idle, FrequencyChange
+
+
+class Simulation:
+    # Event-driven replacement for the per-tick loops. Instead of stepping
+    # one quantum at a time, each step jumps to the next tick at which the
+    # tick loop could make a different decision: a release, a completion, a
+    # queued deadline expiring, the horizon, or (for CC-EDF) a frequency
+    # change. Within a step the running task, frequency and power are fixed.
+    # Settings come from the scheduler's SimulationConfig.
+
+    def __init__(self, scheduler, tasks, frequency=None, power=None, exec_range=(100, 100), trace=None):
+        self.scheduler = scheduler
+        self.cfg = scheduler.cfg
+        # A fixed frequency/power pair runs plain EDF; None asks the
+        # scheduler's adjust_frequency() at every event (CC-EDF).
+        self.frequency = frequency
+        self.power = power
+        self.exec_range = exec_range
+        self.trace = trace or NULL_SINK
+        scheduler.trace = self.trace
+        self.last_frequency = None
+        self.busy_ticks = {}  # (frequency, power) -> ticks executed
+        self.idle_ticks = 0
+        self.tasks = list(tasks)
+        for task in self.tasks:
+            scheduler.add_periodic_task(task)
+
+    def step(self, until):
+        scheduler = self.scheduler
+        scheduler.handle_arrivals()
+        scheduler.check_deadline_misses()
+        now = scheduler.current_ticks
+
+        dynamic = self.frequency is None
+        if dynamic:
+            frequency, power = scheduler.adjust_frequency()
+        else:
+            frequency, power = self.frequency, self.power
+
+        if scheduler.currently_running_task:
+            task = scheduler.currently_running_task
+        else:
+            task = scheduler.schedule()
+
+        ticks = until - now
+        release = scheduler.next_arrival_ticks()
+        if release is not None:
+            ticks = min(ticks, release - now)
+        earliest = scheduler.earliest_deadline_ticks()
+        if earliest is not None:
+            # check_deadline_misses() drops a queued job once its deadline is in the past
+            ticks = min(ticks, earliest + 1 - now)
+
+        if task:
+            ticks = min(ticks, task.ticks_to_complete(frequency))
+            if dynamic:
+                d_min = task.deadline_ticks
+                if earliest is not None:
+                    d_min = min(d_min, earliest)
+                if d_min > now:
+                    # adjust_frequency() switches to max once D_min is reached
+                    ticks = min(ticks, d_min - now)
+
+            scheduler.currently_running_task = task
+            key = (frequency, power)
+            self.busy_ticks[key] = self.busy_ticks.get(key, 0) + ticks
+            trace = self.trace
+            if trace.enabled:
+                if frequency != self.last_frequency:
+                    self.last_frequency = frequency
+                    trace.emit(FrequencyChange(now, frequency, power))
+                trace.emit(Run(now, now + ticks, task, task.deadline_ticks, frequency, power))
+            # Completion is stamped at the end of the segment
+            scheduler.advance_time(ticks)
+            if task.execute(ticks, frequency):
+                scheduler.complete_task(task, self.exec_range[0], self.exec_range[1])
+        else:
+            self.idle_ticks += ticks
+            if self.trace.enabled:
+                self.trace.emit(Idle(now, now + ticks, self.cfg.idle_power))
+            scheduler.advance_time(ticks)
+
+    def run(self, until):
+        while self.scheduler.current_ticks < until:
+            self.step(until)
+
+    def events(self, until):
+        # The run as a stream of tracing events, pulled one step at a time:
+        # memory stays bounded by a single step's events and the consumer can
+        # stop whenever it likes. The simulation's own sink is set aside
+        # while the stream is open.
+        buffer = BufferSink()
+        previous = self.trace
+        self.trace = self.scheduler.trace = buffer
+        try:
+            while self.scheduler.current_ticks < until:
+                self.step(until)
+                yield from buffer.drain()
+        finally:
+            self.trace = self.scheduler.trace = previous
+
+    def run_hyperperiods(self, until, hyperperiod):
+        # For deterministic runs (fixed frequency, 100% WCET) the schedule is
+        # periodic once its state at a hyperperiod boundary repeats. Simulate
+        # boundary to boundary until that happens, then add the metrics of
+        # the repeating cycle in closed form and simulate only the remainder.
+        # Falls back to plain simulation when no repeat fits in the horizon.
+        scheduler = self.scheduler
+        seen = {}
+        while scheduler.current_ticks + hyperperiod <= until:
+            if scheduler.current_ticks % hyperperiod == 0:
+                key = self.state_key()
+                if key in seen:
+                    self.skip_cycles(until, *seen[key])
+                    break
+                seen[key] = (scheduler.current_ticks, dict(self.busy_ticks),
+                             self.idle_ticks, scheduler.missed_deadlines)
+            boundary = (scheduler.current_ticks // hyperperiod + 1) * hyperperiod
+            self.run(boundary)
+        self.run(until)
+
+    def state_key(self):
+        # Everything the rest of the run depends on, relative to the current
+        # tick. Queue order is included because it decides equal-deadline ties.
+        scheduler = self.scheduler
+        now = scheduler.current_ticks
+        tasks = scheduler.tasks
+
+        def job(task_id):
+            task = tasks[task_id]
+            return (task_id, task.next_arrival_ticks - now,
+                    task.deadline_ticks - now, task.remaining_ticks)
+
+        running = scheduler.currently_running_task
+        return (tuple(job(task_id) for _, task_id in scheduler.pending_tasks),
+                tuple(job(task_id) for _, task_id in scheduler.ready_queue),
+                job(running.task_id) if running else None)
+
+    def skip_cycles(self, until, start_ticks, busy_ticks, idle_ticks, missed):
+        scheduler = self.scheduler
+        cycle = scheduler.current_ticks - start_ticks
+        cycles = (until - scheduler.current_ticks) // cycle
+        if cycles <= 0:
+            return
+        for key, ticks in self.busy_ticks.items():
+            self.busy_ticks[key] = ticks + cycles * (ticks - busy_ticks.get(key, 0))
+        self.idle_ticks += cycles * (self.idle_ticks - idle_ticks)
+        scheduler.missed_deadlines += cycles * (scheduler.missed_deadlines - missed)
+
+        shift = cycles * cycle
+        for task in self.tasks:
+            task.next_arrival_ticks += shift
+            task.deadline_ticks += shift
+        # Shifting every key by the same amount keeps both heaps valid
+        scheduler.pending_tasks = [(arrival + shift, task_id) for arrival, task_id in scheduler.pending_tasks]
+        scheduler.ready_queue = [(deadline + shift, task_id) for deadline, task_id in scheduler.ready_queue]
+        scheduler.advance_time(shift)
+
+    def total_energy(self):
+        busy = sum(power * ticks for (_, power), ticks in self.busy_ticks.items())
+        return (busy + self.cfg.idle_power * self.idle_ticks) * self.cfg.time_quantum
+
+    def results(self):
+        return self.total_energy(), self.idle_ticks*self.cfg.time_quantum, self.scheduler.missed_deadlines
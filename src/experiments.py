@@ -0,0 +1,179 @@
+# experiments.py
+
+import argparse
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import config
+from export import ColumnarWriter
+from main import calculate_utilization, get_static_frequency, run_schedule, run_cc_edf, run_la_edf, cc_safe_frequency
+
+# The README's light / medium / heavy utilization study
+UTILIZATION_LEVELS = {"light": 0.3, "medium": 0.6, "heavy": 0.9}
+
+ALGORITHMS = ["Basic EDF", "Static EDF", "CC-EDF", "LA-EDF"]
+
+SWEEP_SCHEMA = (("set_id", "int"), ("level", "str"), ("target_utilization", "float"), ("utilization", "float"),
+                ("tasks", "int"), ("algorithm", "str"), ("energy", "float"), ("idle", "float"), ("missed", "int"))
+
+
+def uunifast(n, utilization, rng):
+    # Bini & Buttazzo: n task utilizations summing to `utilization`,
+    # uniformly distributed over the valid simplex
+    utilizations = []
+    remaining = utilization
+    for i in range(1, n):
+        next_remaining = remaining * rng.random() ** (1.0 / (n - i))
+        utilizations.append(remaining - next_remaining)
+        remaining = next_remaining
+    utilizations.append(remaining)
+    return utilizations
+
+
+def uniform_periods(n, rng, min_period, max_period):
+    return [rng.uniform(min_period, max_period) for _ in range(n)]
+
+
+def loguniform_periods(n, rng, min_period, max_period):
+    # Spreads periods evenly across orders of magnitude
+    low, high = math.log(min_period), math.log(max_period)
+    return [math.exp(rng.uniform(low, high)) for _ in range(n)]
+
+
+def harmonic_periods(n, rng, min_period, max_period):
+    # Powers of two times min_period keep the hyperperiod equal to the longest period
+    steps = max(0, int(math.log2(max_period / min_period)))
+    return [min_period * 2 ** rng.randint(0, steps) for _ in range(n)]
+
+
+PERIOD_DISTRIBUTIONS = {
+    "uniform": uniform_periods,
+    "loguniform": loguniform_periods,
+    "harmonic": harmonic_periods,
+}
+
+
+def generate_task_set(n, utilization, rng, period_distribution="loguniform", min_period=1, max_period=100, cfg=None):
+    tps = (cfg or config.current()).ticks_per_second
+    periods = PERIOD_DISTRIBUTIONS[period_distribution](n, rng, min_period, max_period)
+    tasks = []
+    for i, (u, period) in enumerate(zip(uunifast(n, utilization, rng), periods)):
+        # Snap to the time quantum so the tick model sees the generated values
+        period = max(1, round(period * tps)) / tps
+        execution = max(1, round(u * period * tps)) / tps
+        tasks.append({"name": f"Task{i+1}", "execution_time_sec": execution, "period_sec": period})
+    return tasks
+
+
+def run_task_set(set_id, level, target, tasks_info, seed, cfg):
+    # cfg travels with the job, so workers need no shared settings
+    utilization = calculate_utilization(tasks_info)
+    static_freq, static_power = get_static_frequency(tasks_info, cfg=cfg)
+    results = {
+        "Basic EDF": run_schedule(tasks_info, cfg.max_frequency, cfg.max_power, cfg=cfg),
+        "Static EDF": run_schedule(tasks_info, static_freq, static_power, cfg=cfg),
+    }
+    results["CC-EDF"] = run_cc_edf(tasks_info, cc_safe_frequency(utilization, cfg), seed=seed, cfg=cfg)
+    results["LA-EDF"] = run_la_edf(tasks_info, seed=seed, cfg=cfg)
+
+    rows = []
+    for algorithm in ALGORITHMS:
+        energy, idle, missed = results[algorithm]
+        rows.append({
+            "set_id": set_id, "level": level, "target_utilization": target,
+            "utilization": round(utilization, 6), "tasks": len(tasks_info),
+            "algorithm": algorithm, "energy": energy, "idle": idle, "missed": missed,
+        })
+    return rows
+
+
+def run_chunk(jobs):
+    # Several task sets per submission keep IPC overhead small next to the work
+    rows = []
+    for job in jobs:
+        rows.extend(run_task_set(*job))
+    return rows
+
+
+def chunked(jobs, size):
+    chunk = []
+    for job in jobs:
+        chunk.append(job)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def sweep_jobs(sets_per_level, num_tasks, levels, seed, period_distribution, min_period, max_period, cfg):
+    # Every task set gets its own generator stream, so the sweep does not
+    # depend on how jobs are spread over workers
+    set_id = 0
+    for level, target in levels.items():
+        for _ in range(sets_per_level):
+            rng = random.Random(f"{seed}:{set_id}")
+            tasks = generate_task_set(num_tasks, target, rng, period_distribution, min_period, max_period, cfg)
+            yield set_id, level, target, tasks, seed + set_id, cfg
+            set_id += 1
+
+
+def run_sweep(out_path, sets_per_level=100, num_tasks=5, levels=None, seed=0, workers=None,
+              period_distribution="loguniform", min_period=1, max_period=100, chunk_size=8, cfg=None):
+    levels = levels or UTILIZATION_LEVELS
+    cfg = cfg or config.current()
+    # Running sums per (level, algorithm); the rows themselves go straight to disk
+    totals = {}
+
+    start = time.perf_counter()
+    # The rows go out as CSV, Parquet or Arrow by the extension of out_path
+    with ColumnarWriter(out_path, SWEEP_SCHEMA, batch=4096) as writer, \
+            ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        jobs = sweep_jobs(sets_per_level, num_tasks, levels, seed, period_distribution, min_period, max_period, cfg)
+        futures = [pool.submit(run_chunk, chunk) for chunk in chunked(jobs, chunk_size)]
+        for done, future in enumerate(as_completed(futures), 1):
+            rows = future.result()
+            writer.write_many(rows)
+            for row in rows:
+                total = totals.setdefault((row["level"], row["algorithm"]), [0, 0, 0, 0])
+                total[0] += 1
+                total[1] += row["energy"]
+                total[2] += row["idle"]
+                total[3] += row["missed"]
+            if done % 10 == 0:
+                print(f"{done}/{len(futures)} chunks done ({time.perf_counter() - start:.1f}s)")
+    elapsed = time.perf_counter() - start
+
+    summary = []
+    for (level, algorithm), (count, energy, idle, missed) in totals.items():
+        summary.append({"level": level, "algorithm": algorithm, "sets": count,
+                        "mean_energy": energy / count, "mean_idle": idle / count, "mean_missed": missed / count})
+    summary.sort(key=lambda r: (list(levels).index(r["level"]), ALGORITHMS.index(r["algorithm"])))
+    return summary, elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Utilization sweep over random task sets")
+    parser.add_argument("--sets", type=int, default=100, help="task sets per utilization level")
+    parser.add_argument("--tasks", type=int, default=5, help="tasks per set")
+    parser.add_argument("--levels", nargs="+", type=float,
+                        help="target utilizations (default: light/medium/heavy)")
+    parser.add_argument("--periods", choices=sorted(PERIOD_DISTRIBUTIONS), default="loguniform")
+    parser.add_argument("--min-period", type=float, default=1)
+    parser.add_argument("--max-period", type=float, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=8, help="task sets per worker submission")
+    parser.add_argument("--out", default="sweep_results.csv", help=".csv, or .parquet/.arrow with pyarrow")
+    args = parser.parse_args()
+
+    levels = {f"U={u}": u for u in args.levels} if args.levels else None
+    summary, elapsed = run_sweep(args.out, args.sets, args.tasks, levels, args.seed, args.workers,
+                                 args.periods, args.min_period, args.max_period, args.chunk_size)
+    print(f"\nSweep finished in {elapsed:.1f}s, rows written to {args.out}")
+    for row in summary:
+        print(f"{row['level']:>8} {row['algorithm']:<11} E={row['mean_energy']:.2f}J, "
+              f"Idle={row['mean_idle']:.2f}s, Missed={row['mean_missed']:.2f} ({row['sets']} sets)")
@@ -0,0 +1,168 @@
+# export.py
+
+import csv
+import os
+
+import config
+from intervals import IDLE
+from tracing import NullSink, Run, Idle
+
+# Results as tables for downstream analysis: per-run summaries and,
+# optionally, per-segment schedules. Rows are buffered and written out
+# every `batch` rows (turned into columns first for Parquet and Arrow),
+# so an export of any length runs in constant memory. CSV needs nothing
+# extra; Parquet and Arrow IPC (Feather v2) files are written with
+# pyarrow, imported only when one is asked for.
+#
+# Schemas are (column, type) pairs with types "int", "float" and "str".
+
+FORMATS = {".csv": "csv", ".parquet": "parquet", ".arrow": "arrow", ".feather": "arrow"}
+
+SUMMARY_SCHEMA = (("algorithm", "str"), ("tasks", "int"), ("utilization", "float"), ("frequency", "float"),
+                  ("power", "float"), ("energy", "float"), ("idle", "float"), ("missed", "int"))
+# One row per stretch of the schedule at one operating point, in seconds
+# and joules; idle stretches have task "" and task_id -1
+SEGMENT_SCHEMA = (("algorithm", "str"), ("start", "float"), ("end", "float"), ("task", "str"), ("task_id", "int"),
+                  ("frequency", "float"), ("power", "float"), ("energy", "float"))
+
+
+def format_of(path):
+    fmt = FORMATS.get(os.path.splitext(path)[1].lower())
+    if fmt is None:
+        raise ValueError(f"Cannot tell the export format of {path}; use one of {', '.join(FORMATS)}")
+    return fmt
+
+
+def require_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError("Parquet and Arrow export need pyarrow (pip install pyarrow); "
+                          "CSV export works without it") from None
+    return pyarrow
+
+
+class ColumnarWriter:
+    # Streams rows to `path` in batches of `batch` rows. The format comes
+    # from the file extension unless `fmt` is given.
+
+    def __init__(self, path, schema, fmt=None, batch=65536):
+        self.fmt = fmt or format_of(path)
+        if self.fmt not in ("csv", "parquet", "arrow"):
+            raise ValueError(f"Unknown export format {self.fmt!r}")
+        self.schema = tuple(schema)
+        self.names = [name for name, _ in self.schema]
+        self.batch = batch
+        self.buffer = []
+        self.rows = 0  # rows written out so far
+        if self.fmt == "csv":
+            self.file = open(path, "w", newline="", buffering=1 << 20)
+            self.csv = csv.writer(self.file, lineterminator="\n")
+            self.csv.writerow(self.names)
+            return
+        pa = require_pyarrow()
+        types = {"int": pa.int64(), "float": pa.float64(), "str": pa.string()}
+        self.arrow_schema = pa.schema([(name, types[kind]) for name, kind in self.schema])
+        if self.fmt == "parquet":
+            import pyarrow.parquet
+            self.file = None
+            self.writer = pyarrow.parquet.ParquetWriter(path, self.arrow_schema)
+        else:
+            import pyarrow.ipc
+            self.file = pa.OSFile(path, "wb")
+            self.writer = pyarrow.ipc.new_file(self.file, self.arrow_schema)
+
+    def write_row(self, row):
+        # `row` holds the values in schema order
+        buffer = self.buffer
+        buffer.append(row)
+        if len(buffer) >= self.batch:
+            self.flush()
+
+    def write(self, record):
+        # A dict by column name; missing columns are written as nulls
+        self.write_row([record.get(name) for name in self.names])
+
+    def write_many(self, records):
+        for record in records:
+            self.write(record)
+
+    def flush(self):
+        buffer = self.buffer
+        if not buffer:
+            return
+        self.rows += len(buffer)
+        if self.fmt == "csv":
+            self.csv.writerows(buffer)
+        else:
+            pa = require_pyarrow()
+            arrays = [pa.array(column, type=field.type) for column, field in zip(zip(*buffer), self.arrow_schema)]
+            batch = pa.RecordBatch.from_arrays(arrays, schema=self.arrow_schema)
+            if self.fmt == "parquet":
+                self.writer.write_table(pa.Table.from_batches([batch]))
+            else:
+                self.writer.write_batch(batch)
+        self.buffer = []
+
+    def close(self):
+        self.flush()
+        if self.fmt != "csv":
+            self.writer.close()
+        if self.file is not None:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def export_rows(path, schema, records, fmt=None, batch=65536):
+    # Writes an iterable of dicts; a generator is consumed as it is written
+    with ColumnarWriter(path, schema, fmt, batch) as writer:
+        writer.write_many(records)
+    return writer.rows
+
+
+class SegmentSink(NullSink):
+    # Writes a simulation's Run and Idle events to `writer` as
+    # SEGMENT_SCHEMA rows, merging back-to-back segments of one task at one
+    # operating point. Several runs can share a writer; close() the sink
+    # at the end of each run to write its last segment.
+    enabled = True
+
+    def __init__(self, writer, algorithm="", cfg=None):
+        self.writer = writer
+        self.algorithm = algorithm
+        self.cfg = cfg or config.current()
+        self.pending = None  # [start, end, task, task id, frequency, power] in ticks
+
+    def emit(self, event):
+        kind = type(event)
+        if kind is Run:
+            task = event.task
+            name, task_id, frequency = task.name, task.task_id, event.frequency
+        elif kind is Idle:
+            name, task_id, frequency = "", IDLE, 0.0
+        else:
+            return
+        pending = self.pending
+        if (pending is not None and pending[1] == event.start and pending[3] == task_id and pending[2] == name
+                and pending[4] == frequency and pending[5] == event.power):
+            pending[1] = event.end
+            return
+        self.flush()
+        self.pending = [event.start, event.end, name, task_id, frequency, event.power]
+
+    def flush(self):
+        if self.pending is None:
+            return
+        start, end, name, task_id, frequency, power = self.pending
+        q = self.cfg.time_quantum
+        self.writer.write_row((self.algorithm, start * q, end * q, name, task_id, frequency, power,
+                               power * (end - start) * q))
+        self.pending = None
+
+    def close(self):
+        self.flush()
@@ -2,10 +2,93 @@ import tkinter as tk
 from tkinter import ttk
 import customtkinter as ctk
 from task import Task
-from edf import EDFScheduler, CC_EDFScheduler
+from edf import EDFScheduler
+from intervals import IntervalTrace, IDLE
 import config
-from main import calculate_utilization
+from main import calculate_utilization, get_static_frequency, cc_safe_frequency, build_schedule, build_cc_edf, build_la_edf
+from cache import canonical_tasks, default_cache, trace_key
 import copy
+import queue
+import threading
+
+class PagedTable:
+    # A Treeview over an IntervalTrace that only ever holds one page of
+    # rows; paging and "go to time" look rows up in the trace directly.
+    PAGE_SIZE = 100
+
+    def __init__(self, parent, show_frequency):
+        self.show_frequency = show_frequency
+        self.trace = None
+        self.page = 0
+        columns = ("Time", "Task", "Frequency", "Energy") if show_frequency else ("Time", "Task", "Energy")
+        self.tree = ttk.Treeview(parent, columns=columns, show="headings", height=15)
+        headings = {"Time": "Time", "Task": "Task", "Frequency": "Frequency (GHz)", "Energy": "Energy (J)"}
+        for column in columns:
+            self.tree.heading(column, text=headings[column])
+        self.tree.pack(padx=5, pady=5, fill="both", expand=True)
+
+        controls = ctk.CTkFrame(parent)
+        controls.pack(padx=5, pady=(0, 5), fill="x")
+        ctk.CTkButton(controls, text="< Prev", width=70, command=lambda: self.show_page(self.page - 1)).pack(side="left", padx=5)
+        ctk.CTkButton(controls, text="Next >", width=70, command=lambda: self.show_page(self.page + 1)).pack(side="left", padx=5)
+        self.page_label = ctk.CTkLabel(controls, text="")
+        self.page_label.pack(side="left", padx=5)
+        ctk.CTkButton(controls, text="Go", width=40, command=self.go_to_time).pack(side="right", padx=5)
+        self.time_entry = ctk.CTkEntry(controls, placeholder_text="Go to time (sec)", width=120)
+        self.time_entry.pack(side="right", padx=5)
+        self.summary_label = ctk.CTkLabel(parent, text="")
+        self.summary_label.pack(pady=(0, 5))
+
+    def clear(self):
+        self.trace = None
+        self.tree.delete(*self.tree.get_children())
+        self.page_label.configure(text="")
+        self.summary_label.configure(text="")
+
+    def show(self, trace, idle_time, missed):
+        self.trace = trace
+        self.summary_label.configure(
+            text=f"Energy: {trace.energy():.2f} J, Idle Time: {idle_time:.2f}s, Missed: {missed}"
+        )
+        self.show_page(0)
+
+    def page_count(self):
+        return max(1, -(-len(self.trace) // self.PAGE_SIZE))
+
+    def show_page(self, page):
+        if self.trace is None:
+            return
+        self.page = min(max(page, 0), self.page_count() - 1)
+        self.tree.delete(*self.tree.get_children())
+        first = self.page * self.PAGE_SIZE
+        for i in range(first, min(first + self.PAGE_SIZE, len(self.trace))):
+            self.tree.insert("", "end", values=self.row(i))
+        self.page_label.configure(text=f"Page {self.page + 1} of {self.page_count()} ({len(self.trace)} intervals)")
+
+    def row(self, i):
+        start, end, task_id, frequency, power = self.trace[i]
+        quantum = self.trace.time_quantum
+        time = f"{start * quantum:.2f}s-{end * quantum:.2f}s"
+        energy = f"{power * (end - start) * quantum:.2f}"
+        if self.show_frequency:
+            return time, self.trace.name(task_id), f"{frequency:.2f}" if task_id != IDLE else "N/A", energy
+        return time, self.trace.name(task_id), energy
+
+    def go_to_time(self):
+        if self.trace is None:
+            return
+        try:
+            tick = int(float(self.time_entry.get()) / self.trace.time_quantum)
+        except ValueError:
+            return
+        i = self.trace.index_at(tick)
+        if i is None:
+            i = len(self.trace) - 1 if len(self.trace) and tick >= self.trace.ends[-1] else 0
+        self.show_page(i // self.PAGE_SIZE)
+        row = self.tree.get_children()[i % self.PAGE_SIZE]
+        self.tree.selection_set(row)
+        self.tree.see(row)
+
 
 class SchedulerGUI(ctk.CTk):
     def __init__(self):
@@ -17,6 +100,10 @@ class SchedulerGUI(ctk.CTk):
 
         self.tasks = []
         self.scheduler = EDFScheduler()
+        # Traces of earlier runs, so re-running an unchanged set skips the simulation
+        self.cache = default_cache()
+        self.worker = None
+        self.cancel_event = None
 
         # ================= UI FRAMES ================= #
         self.input_frame = ctk.CTkFrame(self)
@@ -120,8 +207,17 @@ class SchedulerGUI(ctk.CTk):
         self.apply_settings_button.grid(row=13, column=1, sticky="se", padx=5, pady=5)
 
         # ================= SCHEDULE SECTION ================= #
-        self.schedule_button = ctk.CTkButton(self.schedule_frame, text="Generate Schedule", command=self.run_scheduler)
-        self.schedule_button.pack(pady=5)
+        self.schedule_controls = ctk.CTkFrame(self.schedule_frame)
+        self.schedule_controls.pack(pady=5)
+        self.schedule_button = ctk.CTkButton(self.schedule_controls, text="Generate Schedule", command=self.run_scheduler)
+        self.schedule_button.pack(side="left", padx=5)
+        self.cancel_button = ctk.CTkButton(self.schedule_controls, text="Cancel", command=self.cancel_scheduler, state="disabled")
+        self.cancel_button.pack(side="left", padx=5)
+        self.progress_bar = ctk.CTkProgressBar(self.schedule_controls)
+        self.progress_bar.set(0)
+        self.progress_bar.pack(side="left", padx=5)
+        self.status_label = ctk.CTkLabel(self.schedule_controls, text="")
+        self.status_label.pack(side="left", padx=5)
         
         self.tab_view = ctk.CTkTabview(self.schedule_frame)
         self.tab_view.pack(padx=10, pady=10, fill="both", expand=True)
@@ -129,6 +225,7 @@ class SchedulerGUI(ctk.CTk):
         self.edf_tab = self.tab_view.add("EDF Schedule")
         self.static_edf_tab = self.tab_view.add("Static EDF")
         self.cycle_conserving_tab = self.tab_view.add("Cycle-Conserving DVS EDF")
+        self.look_ahead_tab = self.tab_view.add("Look-Ahead DVS EDF")
 
         self.init_schedule_tables()
 
@@ -246,156 +343,120 @@ class SchedulerGUI(ctk.CTk):
             self.show_error("Invalid input! Please enter valid numbers for Frequency and Power.")
 
     def run_scheduler(self):
+        if self.worker is not None:
+            return
         util = calculate_utilization(self.tasks) * 100
         self.utilization_label.configure(text=f"Task Set Utilization: {util:.2f}%")
 
-        # Clear previous table entries
-        for row in self.edf_table.get_children():
-            self.edf_table.delete(row)
-        for row in self.static_edf_table.get_children():
-            self.static_edf_table.delete(row)
-        for row in self.cc_edf_table.get_children():
-            self.cc_edf_table.delete(row)
-
-        tasks_edf = copy.deepcopy(self.tasks)
-        tasks_static = copy.deepcopy(self.tasks)
-        tasks_cc = copy.deepcopy(self.tasks)
-
-        # Basic EDF: Run with max frequency
-        frequency = config.MAX_FREQUENCY
-        power = config.AVAILABLE_FREQUENCIES[frequency]
-        self.run_and_display_schedule(tasks_edf, frequency, power, self.edf_table, "Basic EDF")
-
-        # Static EDF: Derive static frequency from utilization (like main.py's get_static_frequency logic)
-        # We'll replicate the logic from main.get_static_frequency here:
-        from main import get_static_frequency
-        static_freq, static_power = get_static_frequency(tasks_static)
-        self.run_and_display_schedule(tasks_static, static_freq, static_power, self.static_edf_table, "Static EDF")
-
-        # CC-EDF
-        safe_frequency = static_freq if (sum((t["execution_time_sec"]/t["period_sec"]) for t in tasks_cc) <= 1) else config.MAX_FREQUENCY
-        self.run_and_display_cc_schedule(tasks_cc, safe_frequency, self.cc_edf_table, "Cycle-Conserving EDF")
-
-    def run_and_display_schedule(self, tasks_info, frequency, power, table, description):
-        # Similar to simulate_schedule in main.py but display in the table
-        scheduler = EDFScheduler()
-        from main import init_tasks
-        tasks = init_tasks(tasks_info, frequency, power, (100,100))
-        for task in tasks:
-            scheduler.add_periodic_task(task)
-
-        idle_ticks = 0
-        total_energy = 0
-
-        while scheduler.current_ticks < config.SIMULATION_DURATION_TICKS:
-            scheduler.handle_arrivals()
-            scheduler.check_deadline_misses()
-
-            current_time_sec = scheduler.current_ticks / config.TICKS_PER_SECOND
-
-            if scheduler.currently_running_task:
-                next_task = scheduler.currently_running_task
-            else:
-                next_task = scheduler.schedule()
-
-            if next_task:
-                deadline_sec = next_task.deadline_ticks / config.TICKS_PER_SECOND
-                completed = next_task.execute(1, frequency)
-                energy = power * config.TIME_QUANTUM
-                total_energy += energy
-                table.insert("", "end", values=(f"{current_time_sec:.2f}s", next_task.name, f"{deadline_sec:.2f}s"))
-                if completed:
-                    next_task.reset(100,100)
-                    scheduler.add_periodic_task(next_task)
-                    scheduler.currently_running_task = None
-                else:
-                    scheduler.currently_running_task = next_task
-            else:
-                # Idle
-                idle_ticks += 1
-                idle_energy = config.IDLE_POWER * config.TIME_QUANTUM
-                total_energy += idle_energy
-                table.insert("", "end", values=(f"{current_time_sec:.2f}s", "Idle", "N/A"))
-
-            scheduler.advance_time(1)
-
-        # Add summary row
-        idle_time = idle_ticks * config.TIME_QUANTUM
-        table.insert("", "end", values=("", f"Idle Time: {idle_time:.2f}s", f"Missed: {scheduler.missed_deadlines}"))
-
-    def run_and_display_cc_schedule(self, tasks_info, safe_frequency, table, description):
-        # Similar to simulate_cc_edf in main.py but display in the table
-        scheduler = CC_EDFScheduler(safe_frequency)
-        rng = config.CC_EDF_EXECUTION_TIME_RANGE
-        from main import init_tasks
-        tasks = init_tasks(tasks_info, config.MAX_FREQUENCY, config.MAX_POWER, (rng["min_percent"], rng["max_percent"]))
-        for t in tasks:
-            scheduler.add_periodic_task(t)
-
-        idle_ticks = 0
-        total_energy = 0
-
-        while scheduler.current_ticks < config.SIMULATION_DURATION_TICKS:
-            scheduler.handle_arrivals()
-            scheduler.check_deadline_misses()
-
-            current_time_sec = scheduler.current_ticks / config.TICKS_PER_SECOND
-
-            current_frequency, current_power = scheduler.adjust_frequency()
-
-            if scheduler.currently_running_task:
-                next_task = scheduler.currently_running_task
-            else:
-                next_task = scheduler.schedule()
-
-            if next_task:
-                deadline_sec = next_task.deadline_ticks / config.TICKS_PER_SECOND
-                completed = next_task.execute(1, current_frequency)
-                energy = current_power * config.TIME_QUANTUM
-                total_energy += energy
-                table.insert("", "end", values=(f"{current_time_sec:.2f}s", next_task.name, f"{current_frequency:.2f}GHz", f"{deadline_sec:.2f}s"))
-                if completed:
-                    if next_task.actual_execution_ticks < next_task.worst_case_execution_ticks:
-                        scheduler.slack_observed = True
-                    next_task.reset(rng["min_percent"], rng["max_percent"])
-                    scheduler.add_periodic_task(next_task)
-                    scheduler.currently_running_task = None
-                else:
-                    scheduler.currently_running_task = next_task
-            else:
-                # Idle
-                idle_ticks += 1
-                idle_energy = config.IDLE_POWER * config.TIME_QUANTUM
-                total_energy += idle_energy
-                table.insert("", "end", values=(f"{current_time_sec:.2f}s", "Idle", f"{current_frequency:.2f}GHz", "N/A"))
-
-            scheduler.advance_time(1)
+        # Clear previous results
+        for table in (self.edf_table, self.static_edf_table, self.cc_edf_table, self.la_edf_table):
+            table.clear()
+
+        # The run works on a snapshot of the settings, so changing them
+        # while it is in flight only affects the next run
+        cfg = config.current()
+        tasks = copy.deepcopy(self.tasks)
+        static_freq, static_power = get_static_frequency(tasks, cfg=cfg)
+        safe_frequency = cc_safe_frequency(calculate_utilization(tasks), cfg)
+        seed = cfg.random_seed
+        # (table, description, cache key or None, simulation factory)
+        runs = [
+            (self.edf_table, "Basic EDF",
+             trace_key("EDF trace", tasks, cfg=cfg, frequency=cfg.max_frequency, power=cfg.max_power),
+             lambda t: build_schedule(t, cfg.max_frequency, cfg.max_power, cfg=cfg)),
+            (self.static_edf_table, "Static EDF",
+             trace_key("EDF trace", tasks, cfg=cfg, frequency=static_freq, power=static_power),
+             lambda t: build_schedule(t, static_freq, static_power, cfg=cfg)),
+            # Unseeded CC-EDF runs differ every time, so only seeded ones are cached
+            (self.cc_edf_table, "Cycle-Conserving EDF",
+             trace_key("CC-EDF trace", tasks, seed, cfg, safe_frequency=safe_frequency) if seed is not None else None,
+             lambda t: build_cc_edf(t, safe_frequency, seed=seed, cfg=cfg)),
+            (self.la_edf_table, "Look-Ahead EDF",
+             trace_key("LA-EDF trace", tasks, seed, cfg) if seed is not None else None,
+             lambda t: build_la_edf(t, seed=seed, cfg=cfg)),
+        ]
+
+        # The simulations run on a worker thread and report back through a
+        # queue that the Tk loop polls; widgets are only touched here.
+        self.cancel_event = threading.Event()
+        self.worker_queue = queue.Queue()
+        self.worker = threading.Thread(target=self.simulate_runs,
+                                       args=(tasks, runs, cfg, self.cancel_event, self.worker_queue), daemon=True)
+        self.schedule_button.configure(state="disabled")
+        self.cancel_button.configure(state="normal")
+        self.progress_bar.set(0)
+        self.status_label.configure(text="Simulating...")
+        self.worker.start()
+        self.after(50, self.poll_worker)
+
+    def simulate_runs(self, tasks, runs, cfg, cancel_event, results):
+        # Worker thread: no widget access, only messages on `results`
+        try:
+            until = cfg.duration_ticks
+            for i, (table, description, key, build) in enumerate(runs):
+                columns = self.cache.get(key) if key is not None else None
+                if columns is None:
+                    sim = build(canonical_tasks(tasks) if key is not None else tasks)
+                    trace = IntervalTrace(cfg=cfg)
+                    for n, event in enumerate(sim.events(until)):
+                        trace.add_event(event)
+                        if n % 2000 == 0:
+                            if cancel_event.is_set():
+                                results.put(("cancelled",))
+                                return
+                            results.put(("progress", (i + sim.scheduler.current_ticks / until) / len(runs), description))
+                    _, idle_time, missed = sim.results()
+                    columns = trace.to_columns()
+                    columns["summary"] = [idle_time, missed]
+                    if key is not None:
+                        self.cache.put(key, columns)
+                results.put(("done", table, columns))
+            results.put(("finished",))
+        except Exception as e:
+            # A failed run must still end the wait, or Generate stays disabled
+            results.put(("error", str(e) or type(e).__name__))
 
-        idle_time = idle_ticks * config.TIME_QUANTUM
-        table.insert("", "end", values=("", f"Idle Time: {idle_time:.2f}s", "", f"Missed: {scheduler.missed_deadlines}"))
+    def poll_worker(self):
+        try:
+            while True:
+                message = self.worker_queue.get_nowait()
+                kind = message[0]
+                if kind == "progress":
+                    self.progress_bar.set(message[1])
+                    self.status_label.configure(text=f"Simulating {message[2]}...")
+                elif kind == "done":
+                    _, table, columns = message
+                    table.show(IntervalTrace.from_columns(columns), *columns["summary"])
+                elif kind == "error":
+                    self.progress_bar.set(0)
+                    self.status_label.configure(text="Failed")
+                    self.finish_worker()
+                    self.show_error(f"Simulation failed: {message[1]}")
+                    return
+                else:
+                    self.progress_bar.set(1 if kind == "finished" else 0)
+                    self.status_label.configure(text="Done" if kind == "finished" else "Cancelled")
+                    self.finish_worker()
+                    return
+        except queue.Empty:
+            pass
+        self.after(50, self.poll_worker)
+
+    def cancel_scheduler(self):
+        if self.cancel_event is not None:
+            self.cancel_event.set()
+
+    def finish_worker(self):
+        self.worker = None
+        self.cancel_event = None
+        self.schedule_button.configure(state="normal")
+        self.cancel_button.configure(state="disabled")
 
     def init_schedule_tables(self):
-        # Table in EDF Tab
-        self.edf_table = ttk.Treeview(self.edf_tab, columns=("Time", "Task", "Deadline"), show="headings", height=15)
-        self.edf_table.heading("Time", text="Time")
-        self.edf_table.heading("Task", text="Task")
-        self.edf_table.heading("Deadline", text="Deadline")
-        self.edf_table.pack(padx=5, pady=5, fill="both", expand=True)
-
-        # Table in Static EDF Tab
-        self.static_edf_table = ttk.Treeview(self.static_edf_tab, columns=("Time", "Task", "Deadline"), show="headings", height=15)
-        self.static_edf_table.heading("Time", text="Time")
-        self.static_edf_table.heading("Task", text="Task")
-        self.static_edf_table.heading("Deadline", text="Deadline")
-        self.static_edf_table.pack(padx=5, pady=5, fill="both", expand=True)
-
-        # Table in Cycle-Conserving DVS EDF Tab
-        self.cc_edf_table = ttk.Treeview(self.cycle_conserving_tab, columns=("Time", "Task", "Frequency", "Deadline"), show="headings", height=15)
-        self.cc_edf_table.heading("Time", text="Time")
-        self.cc_edf_table.heading("Task", text="Task")
-        self.cc_edf_table.heading("Frequency", text="Frequency (GHz)")
-        self.cc_edf_table.heading("Deadline", text="Deadline")
-        self.cc_edf_table.pack(padx=5, pady=5, fill="both", expand=True)
+        self.edf_table = PagedTable(self.edf_tab, show_frequency=False)
+        self.static_edf_table = PagedTable(self.static_edf_tab, show_frequency=False)
+        self.cc_edf_table = PagedTable(self.cycle_conserving_tab, show_frequency=True)
+        self.la_edf_table = PagedTable(self.look_ahead_tab, show_frequency=True)
 
     def show_info(self, message):
         info_window = ctk.CTkToplevel(self)
@@ -0,0 +1,213 @@
+# intervals.py
+
+import argparse
+import bisect
+import json
+import mmap
+import struct
+import sys
+from array import array
+
+import config
+from tracing import NullSink, Run, Idle
+
+# A schedule as run-length-encoded intervals (start, end, task id,
+# frequency, power) in ticks, with task id IDLE for idle time. Adjacent
+# segments with the same task and operating point are merged, so memory
+# grows with context switches and frequency changes, not with ticks.
+IDLE = -1
+
+# File layout, little-endian: a 32-byte header, then the columns one after
+# another (starts, ends: int64; frequencies, powers: float64; task ids:
+# int32) and finally the task names as a JSON list. The 8-byte columns come
+# first so every column is aligned and can be used straight from an mmap.
+MAGIC = b"EDFI"
+VERSION = 1
+HEADER = struct.Struct("<4sHHdQI4x")  # magic, version, reserved, time quantum, intervals, names bytes
+
+
+def little_endian(column):
+    if sys.byteorder == "little":
+        return column
+    column = array(column.typecode, column)
+    column.byteswap()
+    return column
+
+
+class IntervalTrace:
+    def __init__(self, names=None, time_quantum=None, cfg=None):
+        self.starts = array("q")
+        self.ends = array("q")
+        self.frequencies = array("d")
+        self.powers = array("d")
+        self.task_ids = array("i")
+        self.names = list(names or [])  # task id -> name
+        self.time_quantum = (cfg or config.current()).time_quantum if time_quantum is None else time_quantum
+        self.mapping = None
+
+    def add(self, start, end, task_id, frequency, power):
+        n = len(self.starts)
+        if (n and self.ends[n - 1] == start and self.task_ids[n - 1] == task_id
+                and self.frequencies[n - 1] == frequency and self.powers[n - 1] == power):
+            self.ends[n - 1] = end
+            return
+        self.starts.append(start)
+        self.ends.append(end)
+        self.task_ids.append(task_id)
+        self.frequencies.append(frequency)
+        self.powers.append(power)
+
+    def add_event(self, event):
+        kind = type(event)
+        if kind is Run:
+            task = event.task
+            while len(self.names) <= task.task_id:
+                self.names.append(None)
+            self.names[task.task_id] = task.name
+            self.add(event.start, event.end, task.task_id, event.frequency, event.power)
+        elif kind is Idle:
+            self.add(event.start, event.end, IDLE, 0.0, event.power)
+
+    @classmethod
+    def from_events(cls, events, cfg=None):
+        # Builds the trace from a Simulation.events() stream
+        trace = cls(cfg=cfg)
+        for event in events:
+            trace.add_event(event)
+        return trace
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __getitem__(self, i):
+        return self.starts[i], self.ends[i], self.task_ids[i], self.frequencies[i], self.powers[i]
+
+    def name(self, task_id):
+        return "Idle" if task_id == IDLE else self.names[task_id]
+
+    def index_at(self, tick):
+        # Index of the interval containing `tick`, or None
+        i = bisect.bisect_right(self.ends, tick)
+        if i < len(self.starts) and self.starts[i] <= tick:
+            return i
+        return None
+
+    def range_indices(self, start, end):
+        # Indices of the intervals overlapping [start, end), in O(log n)
+        first = bisect.bisect_right(self.ends, start)
+        last = bisect.bisect_left(self.starts, end)
+        return range(first, max(first, last))
+
+    def between(self, start, end):
+        for i in self.range_indices(start, end):
+            yield self[i]
+
+    def energy(self, start=0, end=None):
+        # Energy (J) of [start, end), clipping the intervals at the edges
+        if end is None:
+            end = self.ends[-1] if len(self) else 0
+        ticks_energy = 0.0
+        for i in self.range_indices(start, end):
+            ticks = min(self.ends[i], end) - max(self.starts[i], start)
+            ticks_energy += self.powers[i] * ticks
+        return ticks_energy * self.time_quantum
+
+    COLUMNS = ("starts", "ends", "frequencies", "powers", "task_ids")
+
+    def to_columns(self):
+        # Plain lists, for JSON
+        columns = {name: list(getattr(self, name)) for name in self.COLUMNS}
+        columns.update(names=self.names, time_quantum=self.time_quantum)
+        return columns
+
+    @classmethod
+    def from_columns(cls, columns):
+        trace = cls(columns["names"], columns["time_quantum"])
+        for name, typecode in zip(cls.COLUMNS, "qqddi"):
+            setattr(trace, name, array(typecode, columns[name]))
+        return trace
+
+    def save(self, path):
+        names = json.dumps(self.names).encode()
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, 0, self.time_quantum, len(self), len(names)))
+            for column in (self.starts, self.ends, self.frequencies, self.powers, self.task_ids):
+                little_endian(column).tofile(f)
+            f.write(names)
+
+    @classmethod
+    def load(cls, path):
+        # Maps the file read-only; the columns are memoryviews into the map,
+        # so opening a large trace reads only the pages that lookups touch.
+        with open(path, "rb") as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, time_quantum, count, names_length = HEADER.unpack_from(mapping)
+        if magic != MAGIC or version != VERSION:
+            mapping.close()
+            raise ValueError(f"{path} is not a version {VERSION} interval trace")
+        if sys.byteorder != "little":
+            mapping.close()
+            raise ValueError("Interval traces can only be mapped on little-endian machines")
+
+        view = memoryview(mapping)
+        offset = HEADER.size
+        columns = []
+        for typecode in ("q", "q", "d", "d", "i"):
+            size = count * struct.calcsize(typecode)
+            columns.append(view[offset:offset + size].cast(typecode))
+            offset += size
+        trace = cls(json.loads(bytes(view[offset:offset + names_length])), time_quantum)
+        trace.starts, trace.ends, trace.frequencies, trace.powers, trace.task_ids = columns
+        trace.mapping = mapping
+        return trace
+
+    def close(self):
+        if self.mapping is not None:
+            for column in (self.starts, self.ends, self.frequencies, self.powers, self.task_ids):
+                column.release()
+            self.mapping.close()
+            self.mapping = None
+
+
+class IntervalSink(NullSink):
+    # Records a simulation's Run and Idle events into an IntervalTrace
+    enabled = True
+
+    def __init__(self, cfg=None):
+        self.trace = IntervalTrace(cfg=cfg)
+
+    def emit(self, event):
+        self.trace.add_event(event)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record or query a run-length-encoded schedule trace")
+    parser.add_argument("path")
+    parser.add_argument("--algorithm", choices=["edf", "static", "cc"], default="edf",
+                        help="simulate config.TASKS and write the trace to PATH")
+    parser.add_argument("--read", action="store_true", help="query the trace in PATH instead")
+    parser.add_argument("--start", type=float, default=0, help="query start (s)")
+    parser.add_argument("--end", type=float, default=None, help="query end (s)")
+    args = parser.parse_args()
+
+    if args.read:
+        trace = IntervalTrace.load(args.path)
+        tps = 1 / trace.time_quantum
+        start = int(round(args.start * tps))
+        end = None if args.end is None else int(round(args.end * tps))
+        for s, e, task_id, frequency, power in trace.between(start, trace.ends[-1] if end is None else end):
+            print(f"{s / tps:.2f}-{e / tps:.2f}s {trace.name(task_id)} at {frequency} GHz, {power} W")
+        print(f"{len(trace)} intervals, {trace.energy(start, end):.2f} J in range")
+        trace.close()
+    else:
+        from main import build_schedule, build_cc_edf, calculate_utilization, cc_safe_frequency, get_static_frequency
+        cfg = config.current()
+        if args.algorithm == "cc":
+            sim = build_cc_edf(config.TASKS, cc_safe_frequency(calculate_utilization(config.TASKS), cfg), cfg=cfg)
+        elif args.algorithm == "static":
+            sim = build_schedule(config.TASKS, *get_static_frequency(config.TASKS, cfg=cfg), cfg=cfg)
+        else:
+            sim = build_schedule(config.TASKS, cfg.max_frequency, cfg.max_power, cfg=cfg)
+        trace = IntervalTrace.from_events(sim.events(cfg.duration_ticks), cfg)
+        trace.save(args.path)
+        print(f"{len(trace)} intervals for {cfg.duration_ticks} ticks written to {args.path}")
@@ -0,0 +1,176 @@
+# ledger.py
+
+import argparse
+from array import array
+
+import config
+from tracing import NullSink, Run, Idle, Miss, Completion
+
+# Energy accounting by task and by operating point. The ledger is a trace
+# sink: the per-task and per-frequency tallies cost O(1) per Run or Idle
+# segment whatever its length, and nothing per segment is kept, so memory
+# grows with the number of tasks and frequencies, not with the run.
+
+
+class EnergySeries:
+    # Energy over time in at most `capacity` equal-width bins. When the run
+    # outgrows the bins, neighbouring bins are merged in pairs and the bin
+    # width doubles, so memory stays fixed however long the run is.
+
+    def __init__(self, capacity=1024, bin_ticks=1):
+        if capacity < 2 or capacity % 2:
+            raise ValueError("EnergySeries capacity must be an even number of at least 2")
+        self.capacity = capacity
+        self.bin_ticks = bin_ticks
+        self.bins = array("d")  # joules per bin
+        self.end = 0  # last tick covered
+
+    def coarsen(self):
+        bins = self.bins
+        self.bins = array("d", (bins[i] + (bins[i + 1] if i + 1 < len(bins) else 0.0)
+                                for i in range(0, len(bins), 2)))
+        self.bin_ticks *= 2
+
+    def add(self, start, end, joules):
+        # Spreads a segment's energy evenly over the bins it covers
+        if end <= start:
+            return
+        while end > self.capacity * self.bin_ticks:
+            self.coarsen()
+        self.end = max(self.end, end)
+        per_tick = joules / (end - start)
+        bins, width = self.bins, self.bin_ticks
+        last = (end - 1) // width
+        while len(bins) <= last:
+            bins.append(0.0)
+        for i in range(start // width, last + 1):
+            bins[i] += per_tick * (min(end, (i + 1) * width) - max(start, i * width))
+
+    def points(self, time_quantum):
+        # (bin start in seconds, average power in W over the bin); the last
+        # bin averages over the part of it the run reached
+        width = self.bin_ticks
+        return [(i * width * time_quantum, joules / ((min(self.end, (i + 1) * width) - i * width) * time_quantum))
+                for i, joules in enumerate(self.bins)]
+
+
+class EnergyLedger(NullSink):
+    enabled = True
+
+    def __init__(self, series_bins=1024, cfg=None):
+        self.cfg = cfg or config.current()
+        self.names = []
+        # Per task id
+        self.task_energy = array("d")  # busy power x ticks
+        self.task_ticks = array("q")
+        self.task_jobs = array("q")
+        self.task_missed = array("q")
+        # Per (frequency, power): [busy ticks, power x ticks]
+        self.frequencies = {}
+        self.idle_ticks = 0
+        self.idle_energy = 0.0  # power x ticks
+        self.series = EnergySeries(series_bins)
+
+    def slot(self, task):
+        task_id = task.task_id
+        while len(self.names) <= task_id:
+            self.names.append(None)
+            self.task_energy.append(0.0)
+            for column in (self.task_ticks, self.task_jobs, self.task_missed):
+                column.append(0)
+        self.names[task_id] = task.name
+        return task_id
+
+    def emit(self, event):
+        kind = type(event)
+        if kind is Run:
+            ticks = event.end - event.start
+            energy = event.power * ticks
+            i = self.slot(event.task)
+            self.task_energy[i] += energy
+            self.task_ticks[i] += ticks
+            entry = self.frequencies.get((event.frequency, event.power))
+            if entry is None:
+                entry = self.frequencies[(event.frequency, event.power)] = [0, 0.0]
+            entry[0] += ticks
+            entry[1] += energy
+            self.series.add(event.start, event.end, energy * self.cfg.time_quantum)
+        elif kind is Idle:
+            ticks = event.end - event.start
+            self.idle_ticks += ticks
+            self.idle_energy += event.power * ticks
+            self.series.add(event.start, event.end, event.power * ticks * self.cfg.time_quantum)
+        elif kind is Completion:
+            self.task_jobs[self.slot(event.task)] += 1
+        elif kind is Miss:
+            self.task_missed[self.slot(event.task)] += 1
+
+    def total_ticks(self):
+        return self.idle_ticks + sum(ticks for ticks, _ in self.frequencies.values())
+
+    def total_energy(self):
+        busy = sum(energy for _, energy in self.frequencies.values())
+        return (busy + self.idle_energy) * self.cfg.time_quantum
+
+    def tasks(self):
+        # One row per task, most energy first
+        tq = self.cfg.time_quantum
+        rows = [{"name": name, "energy": self.task_energy[i] * tq, "busy": self.task_ticks[i] * tq,
+                 "jobs": self.task_jobs[i], "missed": self.task_missed[i]}
+                for i, name in enumerate(self.names) if name is not None]
+        return sorted(rows, key=lambda row: -row["energy"])
+
+    def operating_points(self):
+        # One row per frequency used, plus idle; residency is the share of
+        # simulated time spent there
+        tq = self.cfg.time_quantum
+        total = max(1, self.total_ticks())
+        rows = [{"frequency": f, "power": p, "time": ticks * tq, "energy": energy * tq, "residency": ticks / total}
+                for (f, p), (ticks, energy) in sorted(self.frequencies.items())]
+        rows.append({"frequency": "idle", "power": self.cfg.idle_power, "time": self.idle_ticks * tq,
+                     "energy": self.idle_energy * tq, "residency": self.idle_ticks / total})
+        return rows
+
+    def to_dict(self):
+        return {"total_energy": self.total_energy(), "tasks": self.tasks(), "operating_points": self.operating_points(),
+                "series": {"bin_seconds": self.series.bin_ticks * self.cfg.time_quantum,
+                           "energy": list(self.series.bins)}}
+
+    def report(self, top=10):
+        total = self.total_energy() or 1.0
+        lines = [f"{'Task':<16}{'Energy (J)':>12}{'Share':>8}{'Busy (s)':>10}{'Jobs':>8}{'Missed':>8}"]
+        for row in self.tasks()[:top]:
+            lines.append(f"{row['name']:<16}{row['energy']:>12.2f}{row['energy'] / total:>8.1%}"
+                         f"{row['busy']:>10.2f}{row['jobs']:>8}{row['missed']:>8}")
+        lines.append(f"{'Frequency':<16}{'Energy (J)':>12}{'Share':>8}{'Time (s)':>10}{'Resid.':>8}")
+        for row in self.operating_points():
+            label = row["frequency"] if row["frequency"] == "idle" else f"{row['frequency']} GHz"
+            lines.append(f"{label:<16}{row['energy']:>12.2f}{row['energy'] / total:>8.1%}"
+                         f"{row['time']:>10.2f}{row['residency']:>8.1%}")
+        return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Energy by task and frequency for config.TASKS")
+    parser.add_argument("--algorithm", choices=["edf", "static", "cc"], default="cc")
+    parser.add_argument("--bins", type=int, default=20, help="points in the energy-over-time series")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    from main import build_schedule, build_cc_edf, calculate_utilization, cc_safe_frequency, get_static_frequency
+    cfg = config.current()
+    ledger = EnergyLedger(args.bins, cfg)
+    if args.algorithm == "cc":
+        sim = build_cc_edf(config.TASKS, cc_safe_frequency(calculate_utilization(config.TASKS), cfg), ledger,
+                           seed=args.seed, cfg=cfg)
+    elif args.algorithm == "static":
+        sim = build_schedule(config.TASKS, *get_static_frequency(config.TASKS, cfg=cfg), ledger, cfg)
+    else:
+        sim = build_schedule(config.TASKS, cfg.max_frequency, cfg.max_power, ledger, cfg)
+    sim.run(cfg.duration_ticks)
+
+    print(ledger.report())
+    print("Average power over time:")
+    for start, watts in ledger.series.points(cfg.time_quantum):
+        print(f"  {start:8.1f}s {watts:8.2f} W")
+    print(f"Total: {ledger.total_energy():.2f} J (simulation: {sim.total_energy():.2f} J)")
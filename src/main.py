@@ -1,10 +1,16 @@
 # main.py
 
-from edf import EDFScheduler, CC_EDFScheduler
+from edf import EDFScheduler, CC_EDFScheduler, LA_EDFScheduler
 from task import Task
+from engine import Simulation
+from tracing import ConsoleSink
+from analysis import minimum_feasible_frequency
+from cache import canonical_tasks, default_cache, result_key
 import config
 import copy
 import math
+import random
+import sys
 
 def calculate_utilization(tasks_info):
     return sum((t["execution_time_sec"] / t["period_sec"]) for t in tasks_info)
@@ -12,172 +18,226 @@ def calculate_utilization(tasks_info):
 def lcm(a, b):
     return a * b // math.gcd(a, b)
 
-def hyperperiod(tasks):
-    p = [int(round(t["period_sec"] * config.TICKS_PER_SECOND)) for t in tasks]
+def hyperperiod(tasks, cfg=None):
+    cfg = cfg or config.current()
+    p = [cfg.ticks(t["period_sec"]) for t in tasks]
     h = p[0]
     for x in p[1:]:
         h = lcm(h, x)
     return h
 
-def get_static_frequency(tasks_info):
+def get_static_frequency(tasks_info, exact=False, cfg=None):
+    cfg = cfg or config.current()
     utilization = calculate_utilization(tasks_info)
-    max_freq = config.MAX_FREQUENCY
+    max_freq = cfg.max_frequency
+    if exact:
+        # Processor demand analysis at each operating point: accounts for
+        # tick rounding and constrained deadlines, which utilization ignores
+        chosen = minimum_feasible_frequency(tasks_info, cfg)
+        if chosen is None:
+            print("Static: task set is not EDF-feasible at any frequency, using max freq")
+            return max_freq, cfg.max_power
+        return chosen
+
     if utilization > 1:
         # Must use max frequency because the workload exceeds a single CPU at lower speeds
         print("Static: Utilization > 1, using max freq")
-        return max_freq, config.AVAILABLE_FREQUENCIES[max_freq]
+        return max_freq, cfg.max_power
 
     # Find the lowest frequency that can handle the given utilization
     required_freq = utilization * max_freq
 
-    for f in sorted(config.AVAILABLE_FREQUENCIES.keys()):
+    for f, power in cfg.frequencies:
         if f >= required_freq:
             # Do not scale execution_time_sec here.
             # Just return the chosen frequency and power.
-            return f, config.AVAILABLE_FREQUENCIES[f]
+            return f, power
 
     # If none found (unlikely), default to max frequency
-    return max_freq, config.AVAILABLE_FREQUENCIES[max_freq]
+    return max_freq, cfg.max_power
 
 
-def init_tasks(tasks_info, frequency, power, exec_range=(100,100)):
+def init_tasks(tasks_info, frequency, power, exec_range=(100,100), fractions=None, cfg=None):
+    cfg = cfg or config.current()
     task_list = []
-    for info in tasks_info:
-        t = Task(info["name"], info["execution_time_sec"], info["period_sec"], frequency, power)
+    for i, info in enumerate(tasks_info):
+        deadline = info.get("deadline_sec")
+        deadline_ticks = cfg.ticks(deadline) if deadline is not None else None
+        t = Task(info["name"], info["execution_time_sec"], info["period_sec"], frequency, power, deadline_ticks,
+                 task_id=i, cfg=cfg)
+        if fractions is not None:
+            t.fractions = iter(fractions[i])
         t.set_actual_execution_time(exec_range[0], exec_range[1])
         task_list.append(t)
     return task_list
 
-def simulate_schedule(tasks_info, frequency, power, description):
+def build_schedule(tasks_info, frequency, power, trace=None, cfg=None):
+    # EDF at a fixed frequency, ready to run() or to stream events() from
+    cfg = cfg or config.current()
+    scheduler = EDFScheduler(cfg)
+    tasks = init_tasks(tasks_info, frequency, power, (100,100), cfg=cfg)
+    return Simulation(scheduler, tasks, frequency, power, trace=trace)
+
+def run_schedule(tasks_info, frequency, power, trace=None, cfg=None):
+    sim = build_schedule(tasks_info, frequency, power, trace, cfg)
+    if sim.trace.enabled:
+        # A trace needs every cycle's events
+        sim.run(sim.cfg.duration_ticks)
+    else:
+        # Fixed frequency and 100% WCET: nothing is random, so the schedule
+        # repeats and only one cycle of it needs to be simulated.
+        sim.run_hyperperiods(sim.cfg.duration_ticks, hyperperiod(tasks_info, sim.cfg))
+    return sim.results()
+
+class SeededFractions:
+    # Endless execution fractions from a private generator. An object
+    # rather than a closure, so simulations holding one can be pickled.
+    def __init__(self, seed, low, high):
+        self.rng = random.Random(seed)
+        self.low = low
+        self.high = high
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return self.rng.uniform(self.low, self.high)
+
+def seeded_fractions(tasks_info, seed, exec_range):
+    # One private generator shared by all tasks, drawn from as jobs are released
+    fractions = SeededFractions(seed, exec_range[0] / 100.0, exec_range[1] / 100.0)
+    return [fractions for _ in tasks_info]
+
+def build_cc_edf(tasks_info, safe_frequency, trace=None, fractions=None, seed=None, cfg=None):
+    # fractions: optional per-task sequences of pre-sampled execution
+    # fractions to use instead of the global random module
+    # seed: draw them from a private seeded generator instead
+    cfg = cfg or config.current()
+    scheduler = CC_EDFScheduler(safe_frequency, cfg)
+    exec_range = cfg.cc_exec_range
+    if fractions is None and seed is not None:
+        fractions = seeded_fractions(tasks_info, seed, exec_range)
+    tasks = init_tasks(tasks_info, cfg.max_frequency, cfg.max_power, exec_range, fractions, cfg)
+    return Simulation(scheduler, tasks, exec_range=exec_range, trace=trace)
+
+def run_cc_edf(tasks_info, safe_frequency, trace=None, fractions=None, seed=None, cfg=None):
+    sim = build_cc_edf(tasks_info, safe_frequency, trace, fractions, seed, cfg)
+    sim.run(sim.cfg.duration_ticks)
+    return sim.results()
+
+def build_la_edf(tasks_info, trace=None, fractions=None, seed=None, cfg=None):
+    # Look-ahead EDF; execution times are drawn as in CC-EDF (same range,
+    # and a private generator when seeded), not shared with a CC-EDF run
+    cfg = cfg or config.current()
+    scheduler = LA_EDFScheduler(cfg)
+    exec_range = cfg.cc_exec_range
+    if fractions is None and seed is not None:
+        fractions = seeded_fractions(tasks_info, seed, exec_range)
+    tasks = init_tasks(tasks_info, cfg.max_frequency, cfg.max_power, exec_range, fractions, cfg)
+    return Simulation(scheduler, tasks, exec_range=exec_range, trace=trace)
+
+def run_la_edf(tasks_info, trace=None, fractions=None, seed=None, cfg=None):
+    sim = build_la_edf(tasks_info, trace, fractions, seed, cfg)
+    sim.run(sim.cfg.duration_ticks)
+    return sim.results()
+
+def cc_safe_frequency(utilization, cfg=None):
+    # CC-EDF's utilization tracking keeps deadlines on its own, so it only
+    # needs a floor when the task set cannot be scaled at all.
+    cfg = cfg or config.current()
+    return cfg.frequency_list[0] if utilization <= 1 else cfg.max_frequency
+
+def run_cached(cache, algorithm, tasks_info, compute, seed=None, cfg=None, **params):
+    # Looks the run up in `cache` before calling compute(tasks_info). Cached
+    # runs simulate the canonical task order, so a permuted task set gets
+    # the same answer. Traced runs always simulate, since a cached result
+    # has no events to emit.
+    if cache is None:
+        return compute(tasks_info)
+    key = result_key(algorithm, tasks_info, seed, cfg, **params)
+    return tuple(cache.get_or_compute(key, lambda: list(compute(canonical_tasks(tasks_info)))))
+
+def simulate_schedule(tasks_info, frequency, power, description, trace=None, cache=None, cfg=None):
     print(f"\n{description}")
     print(f"Frequency: {frequency} GHz, Power: {power} W")
 
-    scheduler = EDFScheduler()
-    tasks = init_tasks(tasks_info, frequency, power, (100,100))
-    for task in tasks:
-        scheduler.add_periodic_task(task)
-
-    idle_ticks = 0
-    total_energy = 0
-
-    while scheduler.current_ticks < config.SIMULATION_DURATION_TICKS:
-        scheduler.handle_arrivals()
-        scheduler.check_deadline_misses()
-
-        print(f"\nTime: {scheduler.current_ticks/config.TICKS_PER_SECOND:.1f} s")
-
-        if scheduler.currently_running_task:
-            next_task = scheduler.currently_running_task
-        else:
-            next_task = scheduler.schedule()
-
-        if next_task:
-            scheduler.currently_running_task = next_task
-            print(f"Executing {next_task.name} deadline={next_task.deadline_ticks/config.TICKS_PER_SECOND:.1f}s")
-            completed = next_task.execute(1, frequency)
-            energy = power * config.TIME_QUANTUM
-            total_energy += energy
-            print(f"{next_task.name} consumed {energy:.2f} J")
-            if completed:
-                print(f"{next_task.name} completed!")
-                next_task.reset(100,100)
-                scheduler.add_periodic_task(next_task)
-                scheduler.currently_running_task = None
-        else:
-            print("System idle.")
-            idle_ticks += 1
-            idle_energy = config.IDLE_POWER * config.TIME_QUANTUM
-            total_energy += idle_energy
-            print(f"Idle consumed {idle_energy:.2f} J")
-
-        scheduler.advance_time(1)
-
+    if trace is not None and trace.enabled:
+        cache = None
+    total_energy, idle_time, missed = run_cached(
+        cache, "EDF", tasks_info, lambda tasks: run_schedule(tasks, frequency, power, trace, cfg),
+        cfg=cfg, frequency=frequency, power=power
+    )
     print(f"\n{description} completed.")
-    print(f"Energy: {total_energy:.2f} J, Idle: {idle_ticks*config.TIME_QUANTUM:.2f}s, Missed: {scheduler.missed_deadlines}")
-    return total_energy, idle_ticks*config.TIME_QUANTUM, scheduler.missed_deadlines
+    print(f"Energy: {total_energy:.2f} J, Idle: {idle_time:.2f}s, Missed: {missed}")
+    return total_energy, idle_time, missed
 
-def simulate_cc_edf(tasks_info, description, safe_frequency):
+def simulate_cc_edf(tasks_info, description, safe_frequency, trace=None, cache=None, seed=None, cfg=None):
     print(f"\n{description}")
 
-    scheduler = CC_EDFScheduler(safe_frequency)
-    rng = config.CC_EDF_EXECUTION_TIME_RANGE
-    tasks = init_tasks(tasks_info, config.MAX_FREQUENCY, config.MAX_POWER, (rng["min_percent"], rng["max_percent"]))
-    for t in tasks:
-        scheduler.add_periodic_task(t)
-
-    idle_ticks = 0
-    total_energy = 0
-
-    while scheduler.current_ticks < config.SIMULATION_DURATION_TICKS:
-        scheduler.handle_arrivals()
-        scheduler.check_deadline_misses()
-
-        print(f"\nTime: {scheduler.current_ticks/config.TICKS_PER_SECOND:.1f} s")
-
-        current_frequency, current_power = scheduler.adjust_frequency()
-        print(f"Freq: {current_frequency} GHz, Power: {current_power} W")
-
-        if scheduler.currently_running_task:
-            next_task = scheduler.currently_running_task
-        else:
-            next_task = scheduler.schedule()
-
-        if next_task:
-            scheduler.currently_running_task = next_task
-            print(f"Executing {next_task.name} deadline={next_task.deadline_ticks/config.TICKS_PER_SECOND:.1f}s")
-            completed = next_task.execute(1, current_frequency)
-            energy = current_power * config.TIME_QUANTUM
-            total_energy += energy
-            print(f"{next_task.name} consumed {energy:.2f} J")
-            if completed:
-                if next_task.actual_execution_ticks < next_task.worst_case_execution_ticks:
-                    scheduler.slack_observed = True
-                print(f"{next_task.name} completed!")
-                rng = config.CC_EDF_EXECUTION_TIME_RANGE
-                next_task.reset(rng["min_percent"], rng["max_percent"])
-                scheduler.add_periodic_task(next_task)
-                scheduler.currently_running_task = None
-        else:
-            print("System idle.")
-            idle_ticks += 1
-            idle_energy = config.IDLE_POWER * config.TIME_QUANTUM
-            total_energy += idle_energy
-            print(f"Idle consumed {idle_energy:.2f} J")
-
-        scheduler.advance_time(1)
+    if (trace is not None and trace.enabled) or seed is None:
+        cache = None
+    total_energy, idle_time, missed = run_cached(
+        cache, "CC-EDF", tasks_info, lambda tasks: run_cc_edf(tasks, safe_frequency, trace, seed=seed, cfg=cfg),
+        seed, cfg, safe_frequency=safe_frequency
+    )
+    print(f"\n{description} completed.")
+    print(f"Energy: {total_energy:.2f} J, Idle: {idle_time:.2f}s, Missed: {missed}")
+    return total_energy, idle_time, missed
 
+def simulate_la_edf(tasks_info, description, trace=None, cache=None, seed=None, cfg=None):
+    print(f"\n{description}")
+
+    if (trace is not None and trace.enabled) or seed is None:
+        cache = None
+    total_energy, idle_time, missed = run_cached(
+        cache, "LA-EDF", tasks_info, lambda tasks: run_la_edf(tasks, trace, seed=seed, cfg=cfg), seed, cfg
+    )
     print(f"\n{description} completed.")
-    print(f"Energy: {total_energy:.2f} J, Idle: {idle_ticks*config.TIME_QUANTUM:.2f}s, Missed: {scheduler.missed_deadlines}")
-    return total_energy, idle_ticks*config.TIME_QUANTUM, scheduler.missed_deadlines
+    print(f"Energy: {total_energy:.2f} J, Idle: {idle_time:.2f}s, Missed: {missed}")
+    return total_energy, idle_time, missed
 
-def main():
+def main(trace=None, exact=False, cache=None, seed=None, cfg=None):
+    cfg = cfg or config.current()
+    seed = cfg.random_seed if seed is None else seed
     tasks_for_edf = copy.deepcopy(config.TASKS)
     tasks_for_static = copy.deepcopy(config.TASKS)
     tasks_for_cc = copy.deepcopy(config.TASKS)
+    tasks_for_la = copy.deepcopy(config.TASKS)
 
     utilization = calculate_utilization(tasks_for_edf)
     print(f"Utilization: {utilization:.2f}")
 
     # Basic EDF at max frequency:
     edf_energy, edf_idle, edf_missed = simulate_schedule(
-        tasks_for_edf, config.MAX_FREQUENCY, config.MAX_POWER, "Basic EDF"
+        tasks_for_edf, cfg.max_frequency, cfg.max_power, "Basic EDF", trace, cache, cfg
     )
 
     # Static EDF
-    static_freq, static_power = get_static_frequency(tasks_for_static)
+    static_freq, static_power = get_static_frequency(tasks_for_static, exact, cfg)
     static_energy, static_idle, static_missed = simulate_schedule(
-        tasks_for_static, static_freq, static_power, "Static EDF"
+        tasks_for_static, static_freq, static_power, "Static EDF", trace, cache, cfg
     )
 
     # CC-EDF, starting safe and only lowering after slack
-    # Use the static_freq found as a safe lower bound
-    safe_frequency = static_freq if utilization <= 1 else config.MAX_FREQUENCY
-    cc_energy, cc_idle, cc_missed = simulate_cc_edf(tasks_for_cc, "Cycle-Conserving EDF", safe_frequency)
+    safe_frequency = cc_safe_frequency(utilization, cfg)
+    cc_energy, cc_idle, cc_missed = simulate_cc_edf(
+        tasks_for_cc, "Cycle-Conserving EDF", safe_frequency, trace, cache, seed, cfg
+    )
+
+    # Look-ahead EDF, deferring work toward later deadlines
+    la_energy, la_idle, la_missed = simulate_la_edf(
+        tasks_for_la, "Look-Ahead EDF", trace, cache, seed, cfg
+    )
 
     print("\nComparison of Schedules:")
     print(f"Basic EDF:   E={edf_energy:.2f}J, Idle={edf_idle:.2f}s, Missed={edf_missed}")
     print(f"Static EDF:  E={static_energy:.2f}J, Idle={static_idle:.2f}s, Missed={static_missed}")
     print(f"CC-EDF:      E={cc_energy:.2f}J, Idle={cc_idle:.2f}s, Missed={cc_missed}")
+    print(f"LA-EDF:      E={la_energy:.2f}J, Idle={la_idle:.2f}s, Missed={la_missed}")
 
 if __name__ == "__main__":
-    main()
+    # Per-event output is opt-in; plain runs only print the summaries
+    # --exact picks the static frequency by processor demand analysis
+    # --cache reuses results of earlier runs with the same tasks and settings
+    main(ConsoleSink() if "--trace" in sys.argv else None, "--exact" in sys.argv,
+         default_cache() if "--cache" in sys.argv else None)
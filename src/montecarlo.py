@@ -0,0 +1,102 @@
+# montecarlo.py
+
+import argparse
+import math
+import os
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import config
+from main import calculate_utilization, cc_safe_frequency, run_cc_edf
+
+# Two-sided 95% Student-t critical values for 1..30 degrees of freedom
+T_95 = [12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+        2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+        2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042]
+
+
+def t_critical(df):
+    if df <= len(T_95):
+        return T_95[df - 1]
+    # Cornish-Fisher expansion around the normal quantile; exact to 3 decimals past df=30
+    z = 1.959964
+    return z + (z**3 + z) / (4 * df) + (5 * z**5 + 16 * z**3 + 3 * z) / (96 * df**2)
+
+
+def sample_fractions(tasks_info, seed, replication, exec_range, cfg):
+    # Every replication draws from its own child of the run's SeedSequence, so
+    # replication i sees the same numbers whichever worker runs it. All
+    # fractions a run can need (initial job plus one per completion) are
+    # drawn in one call instead of one random.uniform() per job.
+    stream = np.random.SeedSequence(seed, spawn_key=(replication,))
+    rng = np.random.default_rng(stream)
+    jobs = [cfg.duration_ticks // max(1, cfg.ticks(t["period_sec"])) + 2 for t in tasks_info]
+    low, high = exec_range[0] / 100.0, exec_range[1] / 100.0
+    samples = rng.uniform(low, high, size=sum(jobs))
+    return np.split(samples, np.cumsum(jobs)[:-1])
+
+
+def run_replication(tasks_info, seed, replication, cfg):
+    samples = sample_fractions(tasks_info, seed, replication, cfg.cc_exec_range, cfg)
+    safe_frequency = cc_safe_frequency(calculate_utilization(tasks_info), cfg)
+    # tolist() hands the simulator plain floats instead of NumPy scalars
+    return run_cc_edf(tasks_info, safe_frequency, fractions=[row.tolist() for row in samples], cfg=cfg)
+
+
+def run_batch(tasks_info, seed, replications, cfg):
+    return [run_replication(tasks_info, seed, r, cfg) for r in replications]
+
+
+def summarize(values):
+    n = len(values)
+    mean = statistics.fmean(values)
+    if n < 2:
+        return {"mean": mean, "stdev": 0.0, "ci_low": mean, "ci_high": mean}
+    stdev = statistics.stdev(values)
+    half_width = t_critical(n - 1) * stdev / math.sqrt(n)
+    return {"mean": mean, "stdev": stdev, "ci_low": mean - half_width, "ci_high": mean + half_width}
+
+
+def monte_carlo(tasks_info, replications=100, seed=0, workers=None, batch_size=8, cfg=None):
+    # Runs `replications` independent CC-EDF simulations in parallel and
+    # returns the mean and 95% confidence interval of energy, idle time and
+    # missed deadlines. Results come back in replication order, so the
+    # statistics are identical for any worker count.
+    cfg = cfg or config.current()
+    batches = [range(start, min(start + batch_size, replications))
+               for start in range(0, replications, batch_size)]
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        n = len(batches)
+        results = [r for batch in pool.map(run_batch, [tasks_info] * n, [seed] * n, batches, [cfg] * n)
+                   for r in batch]
+    elapsed = time.perf_counter() - start
+
+    energy, idle, missed = zip(*results)
+    return {
+        "replications": replications,
+        "seed": seed,
+        "elapsed": elapsed,
+        "energy": summarize(energy),
+        "idle": summarize(idle),
+        "missed": summarize(missed),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Monte Carlo replications of CC-EDF on config.TASKS")
+    parser.add_argument("--replications", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    summary = monte_carlo(config.TASKS, args.replications, args.seed, args.workers)
+    print(f"CC-EDF Monte Carlo: {summary['replications']} replications, seed {summary['seed']} "
+          f"({summary['elapsed']:.2f}s)")
+    for metric, unit in (("energy", "J"), ("idle", "s"), ("missed", "")):
+        s = summary[metric]
+        print(f"{metric.capitalize():<7} mean={s['mean']:.2f}{unit}, stdev={s['stdev']:.2f}, "
+              f"95% CI=[{s['ci_low']:.2f}, {s['ci_high']:.2f}]")
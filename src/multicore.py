@@ -0,0 +1,295 @@
+# multicore.py
+
+import argparse
+import bisect
+import dataclasses
+import heapq
+import random
+import time
+
+import config
+from main import (calculate_utilization, get_static_frequency, init_tasks, run_schedule, run_cc_edf,
+                  cc_safe_frequency)
+
+# Cores are dicts like tasks: {"idle_power": W, "frequency": GHz or None}.
+# A frequency of None lets the algorithm choose (static EDF: lowest that
+# covers the core's utilization; CC-EDF: dynamic; global EDF: max).
+
+
+def make_cores(count, idle_power=None, frequency=None, cfg=None):
+    cfg = cfg or config.current()
+    return [{"idle_power": cfg.idle_power if idle_power is None else idle_power, "frequency": frequency}
+            for _ in range(count)]
+
+
+def task_utilizations(tasks_info):
+    return [t["execution_time_sec"] / t["period_sec"] for t in tasks_info]
+
+
+# ---- Partitioning heuristics ----
+# Each takes per-task utilizations, the cores and the config, and returns a
+# core index per task. A task that fits nowhere goes to the least loaded
+# core, which then overloads and reports the resulting misses.
+
+def least_loaded(loads):
+    return min(range(len(loads)), key=loads.__getitem__)
+
+
+def first_fit(utilizations, cores, cfg):
+    loads = [0.0] * len(cores)
+    assignment = []
+    for u in utilizations:
+        core = next((c for c, load in enumerate(loads) if load + u <= 1 + 1e-9), None)
+        if core is None:
+            core = least_loaded(loads)
+        loads[core] += u
+        assignment.append(core)
+    return assignment
+
+
+def worst_fit(utilizations, cores, cfg):
+    # Always the least loaded core, kept at the top of a heap: O(n log m)
+    heap = [(0.0, c) for c in range(len(cores))]
+    assignment = []
+    for u in utilizations:
+        load, core = heapq.heappop(heap)
+        heapq.heappush(heap, (load + u, core))
+        assignment.append(core)
+    return assignment
+
+
+def power_rate(load, idle_power, cfg):
+    # Average power of a core running `load` at the lowest frequency that
+    # covers it, idling for the rest of the time
+    if load <= 0:
+        return idle_power
+    i = bisect.bisect_left(cfg.frequency_list, load * cfg.max_frequency - 1e-9)
+    if i == len(cfg.frequency_list):
+        return float("inf")
+    busy = load * cfg.max_frequency / cfg.frequency_list[i]
+    return cfg.power_list[i] * busy + idle_power * (1 - busy)
+
+
+def energy_aware_decreasing(utilizations, cores, cfg):
+    # Largest tasks first, each to the core whose average power grows least
+    # (ties to the less loaded core). O(n m) power evaluations.
+    loads = [0.0] * len(cores)
+    rates = [power_rate(0, core["idle_power"], cfg) for core in cores]
+    assignment = [None] * len(utilizations)
+    for i in sorted(range(len(utilizations)), key=lambda i: -utilizations[i]):
+        u = utilizations[i]
+        best, best_cost = None, None
+        for c, core in enumerate(cores):
+            # A core the task would overload (or already overloaded: inf - inf
+            # is nan, which compares False against everything) costs inf
+            rate = power_rate(loads[c] + u, core["idle_power"], cfg)
+            cost = float("inf") if rate == float("inf") else rate - rates[c]
+            if best is None or (cost, loads[c]) < (best_cost, loads[best]):
+                best, best_cost = c, cost
+        if best_cost == float("inf"):
+            best = least_loaded(loads)
+        loads[best] += u
+        rates[best] = power_rate(loads[best], cores[best]["idle_power"], cfg)
+        assignment[i] = best
+    return assignment
+
+
+PARTITIONERS = {
+    "first-fit": first_fit,
+    "worst-fit": worst_fit,
+    "energy-aware": energy_aware_decreasing,
+}
+
+
+def partition(tasks_info, cores, heuristic="first-fit", cfg=None):
+    cfg = cfg or config.current()
+    assignment = PARTITIONERS[heuristic](task_utilizations(tasks_info), cores, cfg)
+    partitions = [[] for _ in cores]
+    for info, core in zip(tasks_info, assignment):
+        partitions[core].append(info)
+    return partitions
+
+
+def summarize(per_core, missed=None):
+    total = {
+        "energy": sum(c["energy"] for c in per_core),
+        "idle": sum(c["idle"] for c in per_core),
+        "missed": sum(c["missed"] for c in per_core) if missed is None else missed,
+    }
+    return {"cores": per_core, "total": total}
+
+
+def run_partitioned(tasks_info, cores, heuristic="first-fit", algorithm="static", seed=None, cfg=None):
+    # Partitioned EDF: tasks never migrate, so every core is an independent
+    # uniprocessor simulated with the single-core engine under its own idle
+    # power and frequency. algorithm: "edf" (max frequency), "static" or "cc".
+    # Static frequencies come from the exact feasibility test, since the
+    # packers fill cores right up to frequency thresholds where utilization
+    # alone misses tick rounding.
+    cfg = cfg or config.current()
+    per_core = []
+    for c, (core, tasks) in enumerate(zip(cores, partition(tasks_info, cores, heuristic, cfg))):
+        core_cfg = dataclasses.replace(cfg, idle_power=core["idle_power"])
+        utilization = calculate_utilization(tasks)
+        frequency = core["frequency"]
+        if not tasks:
+            idle = core_cfg.duration_ticks * core_cfg.time_quantum
+            energy, missed = core_cfg.idle_power * idle, 0
+            frequency = frequency or cfg.frequency_list[0]
+        elif algorithm == "cc" and frequency is None:
+            core_seed = None if seed is None else seed + c
+            energy, idle, missed = run_cc_edf(tasks, cc_safe_frequency(utilization, core_cfg),
+                                              seed=core_seed, cfg=core_cfg)
+            frequency = "dynamic"
+        else:
+            if frequency is not None:
+                power = core_cfg.power_of[frequency]
+            elif algorithm == "static":
+                frequency, power = get_static_frequency(tasks, exact=True, cfg=core_cfg)
+            else:
+                frequency, power = core_cfg.max_frequency, core_cfg.max_power
+            energy, idle, missed = run_schedule(tasks, frequency, power, cfg=core_cfg)
+        per_core.append({"core": c, "tasks": len(tasks), "utilization": utilization, "frequency": frequency,
+                         "energy": energy, "idle": idle, "missed": missed})
+    return summarize(per_core)
+
+
+class GlobalEDFSimulation:
+    # Global EDF on m cores with fixed per-core frequencies: one ready queue,
+    # and at every event the m earliest-deadline jobs run, the earliest on
+    # the fastest core. Jobs migrate freely. Events are the same as in the
+    # single-core engine (release, completion, queued deadline expiry,
+    # horizon), and each costs O(m log n).
+
+    def __init__(self, tasks_info, cores, exec_range=(100, 100), cfg=None):
+        self.cfg = cfg or config.current()
+        frequencies = [core["frequency"] or self.cfg.max_frequency for core in cores]
+        # Fastest cores first; core_order maps slots back to the caller's core index
+        self.core_order = sorted(range(len(cores)), key=lambda c: -frequencies[c])
+        self.frequencies = [frequencies[c] for c in self.core_order]
+        self.powers = [self.cfg.power_of[f] for f in self.frequencies]
+        self.idle_powers = [cores[c]["idle_power"] for c in self.core_order]
+        self.exec_range = exec_range
+        self.tasks = init_tasks(tasks_info, self.cfg.max_frequency, self.cfg.max_power, exec_range, cfg=self.cfg)
+        self.pending = [(t.next_arrival_ticks, t.task_id) for t in self.tasks]
+        heapq.heapify(self.pending)
+        self.ready = []
+        self.running = []  # task ids, earliest deadline first
+        self.now = 0
+        self.busy_ticks = [0] * len(cores)
+        self.idle_ticks = [0] * len(cores)
+        self.missed = 0  # jobs expire in the shared queue, so misses belong to no core
+
+    def dispatch(self):
+        tasks = self.tasks
+        now = self.now
+        while self.pending and self.pending[0][0] <= now:
+            _, task_id = heapq.heappop(self.pending)
+            heapq.heappush(self.ready, (tasks[task_id].deadline_ticks, task_id))
+        while self.ready and self.ready[0][0] < now:
+            heapq.heappop(self.ready)
+            self.missed += 1
+
+        running = self.running
+        cores = len(self.frequencies)
+        while self.ready:
+            deadline, task_id = self.ready[0]
+            if len(running) < cores:
+                heapq.heappop(self.ready)
+                running.append(task_id)
+            elif deadline < tasks[running[-1]].deadline_ticks:
+                # Preempt the running job with the latest deadline
+                heapq.heappop(self.ready)
+                preempted = running.pop()
+                heapq.heappush(self.ready, (tasks[preempted].deadline_ticks, preempted))
+                running.append(task_id)
+            else:
+                break
+            running.sort(key=lambda i: (tasks[i].deadline_ticks, i))
+
+    def step(self, until):
+        self.dispatch()
+        tasks, now = self.tasks, self.now
+        ticks = until - now
+        if self.pending:
+            ticks = min(ticks, self.pending[0][0] - now)
+        if self.ready:
+            ticks = min(ticks, self.ready[0][0] + 1 - now)
+        for slot, task_id in enumerate(self.running):
+            ticks = min(ticks, tasks[task_id].ticks_to_complete(self.frequencies[slot]))
+
+        for slot in range(len(self.running), len(self.frequencies)):
+            self.idle_ticks[slot] += ticks
+        self.now += ticks
+        finished = []
+        for slot, task_id in enumerate(self.running):
+            self.busy_ticks[slot] += ticks
+            if tasks[task_id].execute(ticks, self.frequencies[slot]):
+                finished.append(task_id)
+        for task_id in finished:
+            task = tasks[task_id]
+            self.running.remove(task_id)
+            task.reset(*self.exec_range)
+            heapq.heappush(self.pending, (task.next_arrival_ticks, task_id))
+
+    def run(self, until=None):
+        until = self.cfg.duration_ticks if until is None else until
+        while self.now < until:
+            self.step(until)
+
+    def results(self):
+        tq = self.cfg.time_quantum
+        per_core = [None] * len(self.frequencies)
+        for slot, core in enumerate(self.core_order):
+            per_core[core] = {
+                "core": core, "tasks": None, "utilization": self.busy_ticks[slot] / max(1, self.now),
+                "frequency": self.frequencies[slot],
+                "energy": (self.busy_ticks[slot] * self.powers[slot] + self.idle_ticks[slot] * self.idle_powers[slot]) * tq,
+                "idle": self.idle_ticks[slot] * tq, "missed": 0,
+            }
+        return summarize(per_core, self.missed)
+
+
+def run_global(tasks_info, cores, cfg=None):
+    sim = GlobalEDFSimulation(tasks_info, cores, cfg=cfg)
+    sim.run()
+    return sim.results()
+
+
+def generate_multicore_task_set(n, utilization, rng, cfg=None):
+    # UUniFast-Discard: redraw until no single task exceeds one core
+    from experiments import generate_task_set
+    for _ in range(1000):
+        tasks = generate_task_set(n, utilization, rng, cfg=cfg)
+        if all(u <= 1 for u in task_utilizations(tasks)):
+            return tasks
+    raise ValueError(f"Could not draw {n} tasks with total utilization {utilization} and each at most 1")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Partitioned or global EDF on a multi-core system")
+    parser.add_argument("--cores", type=int, default=4)
+    parser.add_argument("--tasks", type=int, default=40)
+    parser.add_argument("--utilization", type=float, default=2.4, help="total utilization over all cores")
+    parser.add_argument("--partition", choices=sorted(PARTITIONERS), default="first-fit")
+    parser.add_argument("--algorithm", choices=["edf", "static", "cc", "global"], default="static")
+    parser.add_argument("--idle-power", type=float, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    cfg = config.current()
+    tasks_info = generate_multicore_task_set(args.tasks, args.utilization, random.Random(args.seed), cfg)
+    cores = make_cores(args.cores, args.idle_power, cfg=cfg)
+    start = time.perf_counter()
+    if args.algorithm == "global":
+        result = run_global(tasks_info, cores, cfg)
+    else:
+        result = run_partitioned(tasks_info, cores, args.partition, args.algorithm, args.seed, cfg)
+    elapsed = time.perf_counter() - start
+
+    for core in result["cores"]:
+        tasks = "" if core["tasks"] is None else f"{core['tasks']} tasks, "
+        print(f"Core {core['core']}: {tasks}U={core['utilization']:.2f}, f={core['frequency']}, "
+              f"E={core['energy']:.2f}J, Idle={core['idle']:.2f}s, Missed={core['missed']}")
+    total = result["total"]
+    print(f"Total: E={total['energy']:.2f}J, Idle={total['idle']:.2f}s, Missed={total['missed']} ({elapsed:.2f}s)")
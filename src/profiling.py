@@ -0,0 +1,169 @@
+# profiling.py
+
+import argparse
+import json
+import time
+from collections import Counter, defaultdict
+
+import config
+
+# Opt-in instrumentation of the simulation hot path. A Profiler attached to
+# a Simulation replaces the phase methods of that one simulation's
+# scheduler and tasks with timed wrappers; nothing else changes, so
+# unprofiled runs execute exactly the code they did before and pay nothing.
+# Times are wall-clock seconds from time.perf_counter().
+
+# Scheduler methods timed as phases. complete_task includes Task.reset.
+SCHEDULER_PHASES = ("handle_arrivals", "check_deadline_misses", "adjust_frequency", "schedule", "complete_task")
+TASK_PHASES = ("execute", "reset")
+
+
+def bucket(value):
+    # Power-of-two histogram buckets: 0, 1, 2-3, 4-7, ... so a histogram
+    # stays small whatever the queue lengths
+    if value <= 0:
+        return "0"
+    low = 1 << (value.bit_length() - 1)
+    high = 2 * low - 1
+    return str(low) if low == high else f"{low}-{high}"
+
+
+class Profiler:
+    enabled = True
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.calls = Counter()    # phase -> calls
+        self.seconds = Counter()  # phase -> inclusive time
+        self.stacks = Counter()   # "step;complete_task;reset" -> self time, for flamegraphs
+        self.histograms = defaultdict(Counter)  # name -> bucket -> samples
+        self.frames = []  # [path, time spent in children] of the phases in progress
+        self.attached = []
+
+    def timed(self, name, function):
+        clock, frames = self.clock, self.frames
+        calls, seconds, stacks = self.calls, self.seconds, self.stacks
+
+        def wrapper(*args, **kwargs):
+            frame = [frames[-1][0] + ";" + name if frames else name, 0.0]
+            frames.append(frame)
+            start = clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                frames.pop()
+                if frames:
+                    frames[-1][1] += elapsed
+                calls[name] += 1
+                seconds[name] += elapsed
+                stacks[frame[0]] += elapsed - frame[1]
+        wrapper.__wrapped__ = function
+        return wrapper
+
+    def count(self, name, n=1):
+        self.calls[name] += n
+
+    def sample(self, name, value):
+        self.histograms[name][bucket(value)] += 1
+
+    def attach(self, simulation):
+        # Instruments one simulation: its step, its scheduler's phases and
+        # its tasks, whose class is swapped for a timed subclass
+        scheduler = simulation.scheduler
+        for name in SCHEDULER_PHASES:
+            if hasattr(scheduler, name):
+                setattr(scheduler, name, self.timed(name, getattr(scheduler, name)))
+
+        step = simulation.step
+
+        def sampled_step(until):
+            self.sample("ready_queue", len(scheduler.ready_queue))
+            self.sample("pending_tasks", len(scheduler.pending_tasks))
+            return step(until)
+        simulation.step = self.timed("step", sampled_step)
+
+        classes = {}
+        for task in simulation.tasks:
+            original = type(task)
+            if original not in classes:
+                classes[original] = type(original.__name__, (original,), dict(
+                    {name: self.timed(name, getattr(original, name)) for name in TASK_PHASES},
+                    __slots__=(), __module__=original.__module__))
+            task.__class__ = classes[original]
+        self.attached.append((simulation, {v: k for k, v in classes.items()}))
+
+    def detach(self):
+        # Restores every attached simulation to its unprofiled methods, e.g.
+        # before pickling it
+        for simulation, originals in self.attached:
+            for name in SCHEDULER_PHASES:
+                simulation.scheduler.__dict__.pop(name, None)
+            simulation.__dict__.pop("step", None)
+            for task in simulation.tasks:
+                task.__class__ = originals.get(type(task), type(task))
+        self.attached = []
+
+    def reset(self):
+        self.calls.clear()
+        self.seconds.clear()
+        self.stacks.clear()
+        self.histograms.clear()
+
+    def to_dict(self):
+        return {
+            "phases": {name: {"calls": self.calls[name], "seconds": self.seconds.get(name, 0.0),
+                              "mean_us": self.seconds.get(name, 0.0) / self.calls[name] * 1e6}
+                       for name in sorted(self.calls, key=lambda n: -self.seconds.get(n, 0.0))},
+            "histograms": {name: dict(sorted(counts.items(), key=lambda item: int(item[0].split("-")[0])))
+                           for name, counts in self.histograms.items()},
+        }
+
+    def save_json(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def folded(self):
+        # One "frame;frame;frame weight" line per stack, weights in
+        # microseconds of self time, as flamegraph.pl and speedscope read
+        return "".join(f"{stack} {round(seconds * 1e6)}\n" for stack, seconds in sorted(self.stacks.items()))
+
+    def save_folded(self, path):
+        with open(path, "w") as f:
+            f.write(self.folded())
+
+    def report(self):
+        data = self.to_dict()
+        lines = [f"{'Phase':<22}{'Calls':>12}{'Total (s)':>12}{'Mean (us)':>12}"]
+        for name, phase in data["phases"].items():
+            lines.append(f"{name:<22}{phase['calls']:>12}{phase['seconds']:>12.3f}{phase['mean_us']:>12.2f}")
+        for name, counts in data["histograms"].items():
+            lines.append(f"{name}: " + ", ".join(f"{b}: {n}" for b, n in counts.items()))
+        return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Profile the simulation phases on config.TASKS")
+    parser.add_argument("--algorithm", choices=["edf", "static", "cc"], default="cc")
+    parser.add_argument("--json", help="write the phase timings and histograms to this file")
+    parser.add_argument("--folded", help="write folded stacks for a flamegraph to this file")
+    args = parser.parse_args()
+
+    from main import build_schedule, build_cc_edf, calculate_utilization, cc_safe_frequency, get_static_frequency
+    cfg = config.current()
+    if args.algorithm == "cc":
+        sim = build_cc_edf(config.TASKS, cc_safe_frequency(calculate_utilization(config.TASKS), cfg), cfg=cfg)
+    elif args.algorithm == "static":
+        sim = build_schedule(config.TASKS, *get_static_frequency(config.TASKS, cfg=cfg), cfg=cfg)
+    else:
+        sim = build_schedule(config.TASKS, cfg.max_frequency, cfg.max_power, cfg=cfg)
+    profiler = Profiler()
+    profiler.attach(sim)
+    sim.run(cfg.duration_ticks)
+    profiler.detach()
+
+    print(profiler.report())
+    if args.json:
+        profiler.save_json(args.json)
+    if args.folded:
+        profiler.save_folded(args.folded)
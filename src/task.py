@@ -1,32 +1,59 @@
 # task.py
 
+import math
 import random
+from array import array
 import config
 
+def completion_ticks(work, work_per_tick):
+    # Ticks needed to finish `work` when each tick does work_per_tick of it,
+    # matching the repeated subtraction in Task.execute()
+    ticks = max(1, math.ceil(work / work_per_tick))
+    # Guard against rounding in the division
+    while ticks > 1 and work - (ticks - 1) * work_per_tick <= 0:
+        ticks -= 1
+    while work - ticks * work_per_tick > 0:
+        ticks += 1
+    return ticks
+
 class Task:
-    def __init__(self, name, execution_time_sec, period_sec, frequency, power, deadline_ticks=None):
+    # Fixed attribute slots: no per-instance __dict__, which matters with 10^5 tasks
+    __slots__ = ("name", "task_id", "worst_case_execution_ticks", "period_ticks", "frequency", "power",
+                 "deadline_ticks", "next_arrival_ticks", "actual_execution_ticks", "remaining_ticks", "fractions",
+                 "cfg")
+
+    def __init__(self, name, execution_time_sec, period_sec, frequency, power, deadline_ticks=None, task_id=0,
+                 cfg=None):
+        self.cfg = cfg or config.current()
         self.name = name
-        self.worst_case_execution_ticks = int(round(execution_time_sec * config.TICKS_PER_SECOND))
-        self.period_ticks = int(round(period_sec * config.TICKS_PER_SECOND))
+        self.task_id = task_id  # unique per scheduler; the queues refer to tasks by it
+        self.worst_case_execution_ticks = self.cfg.ticks(execution_time_sec)
+        self.period_ticks = self.cfg.ticks(period_sec)
         self.frequency = frequency
         self.power = power
         self.deadline_ticks = deadline_ticks if deadline_ticks is not None else self.period_ticks
         self.next_arrival_ticks = 0
         self.actual_execution_ticks = self.worst_case_execution_ticks
         self.remaining_ticks = self.worst_case_execution_ticks
+        # Optional iterator of pre-sampled execution fractions, one per job
+        self.fractions = None
 
     def set_actual_execution_time(self, min_percent=100, max_percent=100):
         if min_percent < 100 or max_percent < 100:
             min_fraction = min_percent / 100.0
             max_fraction = max_percent / 100.0
-            exec_time = random.uniform(min_fraction, max_fraction) * self.worst_case_execution_ticks
+            if self.fractions is not None:
+                fraction = next(self.fractions)
+            else:
+                fraction = random.uniform(min_fraction, max_fraction)
+            exec_time = fraction * self.worst_case_execution_ticks
         else:
             exec_time = self.worst_case_execution_ticks
         self.actual_execution_ticks = max(1, int(round(exec_time)))
         self.remaining_ticks = self.actual_execution_ticks
 
     def execute(self, ticks, current_frequency):
-        work_per_tick = current_frequency / config.MAX_FREQUENCY
+        work_per_tick = current_frequency / self.cfg.max_frequency
         work_done = ticks * work_per_tick
         self.remaining_ticks -= work_done
         if self.remaining_ticks <= 0:
@@ -34,13 +61,14 @@ class Task:
             return True
         return False
 
+    def ticks_to_complete(self, current_frequency):
+        # Smallest number of ticks after which execute() reports completion
+        return completion_ticks(self.remaining_ticks, current_frequency / self.cfg.max_frequency)
+
     def reset(self, min_percent=100, max_percent=100):
-        print(f"Resetting {self.name}: Old deadline = {self.deadline_ticks/config.TICKS_PER_SECOND:.1f}s")
         self.set_actual_execution_time(min_percent, max_percent)
         self.deadline_ticks += self.period_ticks
         self.next_arrival_ticks += self.period_ticks
-        print(f"{self.name}: New deadline = {self.deadline_ticks/config.TICKS_PER_SECOND:.1f}s, "
-              f"Execution Time = {self.actual_execution_ticks} ticks")
 
     def scale_execution_time(self, scale_factor):
         # Scale the WCET by scale_factor (max_freq/freq), reducing execution time.
@@ -53,3 +81,50 @@ class Task:
 
     def __lt__(self, other):
         return self.deadline_ticks < other.deadline_ticks
+
+
+class TaskTable:
+    # Struct-of-arrays storage for large task sets: one typed array per
+    # field (8 bytes per task each) instead of a dict per task. Row i is
+    # task id i; Task objects are only built for the tasks being simulated.
+    def __init__(self, cfg=None):
+        self.cfg = cfg or config.current()
+        self.names = []
+        self.period_ticks = array("q")
+        self.wcet_ticks = array("q")
+        self.deadline_ticks = array("q")
+
+    @classmethod
+    def from_tasks_info(cls, tasks_info, cfg=None):
+        table = cls(cfg)
+        for info in tasks_info:
+            table.append(info["name"], info["execution_time_sec"], info["period_sec"], info.get("deadline_sec"))
+        return table
+
+    def append(self, name, execution_time_sec, period_sec, deadline_sec=None):
+        period = self.cfg.ticks(period_sec)
+        self.names.append(name)
+        self.period_ticks.append(period)
+        self.wcet_ticks.append(self.cfg.ticks(execution_time_sec))
+        self.deadline_ticks.append(self.cfg.ticks(deadline_sec) if deadline_sec is not None else period)
+        return len(self.names) - 1
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, i):
+        # The tasks_info dict of row i, for code that takes task dicts
+        tps = self.cfg.ticks_per_second
+        return {"name": self.names[i],
+                "execution_time_sec": self.wcet_ticks[i] / tps,
+                "period_sec": self.period_ticks[i] / tps,
+                "deadline_sec": self.deadline_ticks[i] / tps}
+
+    def task(self, i, frequency, power):
+        task = Task(self.names[i], 0, 0, frequency, power, self.deadline_ticks[i], task_id=i, cfg=self.cfg)
+        task.worst_case_execution_ticks = task.actual_execution_ticks = task.remaining_ticks = self.wcet_ticks[i]
+        task.period_ticks = self.period_ticks[i]
+        return task
+
+    def utilization(self):
+        return sum(c / p for c, p in zip(self.wcet_ticks, self.period_ticks))
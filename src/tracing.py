@@ -0,0 +1,137 @@
+# tracing.py
+
+from collections import Counter, deque, namedtuple
+import config
+
+# Typed trace events. Times are in ticks and tasks are the Task objects
+# themselves; nothing is formatted until a sink decides to. Tasks change
+# as the run goes on, so any per-job value is copied into the event.
+Release = namedtuple("Release", "time task deadline")
+Preempt = namedtuple("Preempt", "time task by")
+Miss = namedtuple("Miss", "time task deadline")
+Completion = namedtuple("Completion", "time task next_deadline execution_ticks")
+Run = namedtuple("Run", "start end task deadline frequency power")
+Idle = namedtuple("Idle", "start end power")
+FrequencyChange = namedtuple("FrequencyChange", "time frequency power")
+
+
+def seconds(ticks, cfg=None):
+    return ticks / (cfg or config.current()).ticks_per_second
+
+
+def format_event(event, cfg=None):
+    cfg = cfg or config.current()
+    kind = type(event)
+    if kind is Release:
+        return f"Task {event.task.name} arrived at {seconds(event.time, cfg):.1f}s with deadline {seconds(event.deadline, cfg):.1f}s."
+    if kind is Preempt:
+        return f"Preempting {event.task.name} for {event.by.name}."
+    if kind is Miss:
+        return f"Task {event.task.name} missed its deadline!"
+    if kind is Completion:
+        return (f"{event.task.name} completed! New deadline = {seconds(event.next_deadline, cfg):.1f}s, "
+                f"Execution Time = {event.execution_ticks} ticks")
+    if kind is Run:
+        energy = event.power * (event.end - event.start) * cfg.time_quantum
+        return (f"Time: {seconds(event.start, cfg):.1f}-{seconds(event.end, cfg):.1f} s "
+                f"Executing {event.task.name} at {event.frequency} GHz, consumed {energy:.2f} J")
+    if kind is Idle:
+        energy = event.power * (event.end - event.start) * cfg.time_quantum
+        return f"Time: {seconds(event.start, cfg):.1f}-{seconds(event.end, cfg):.1f} s System idle, consumed {energy:.2f} J"
+    if kind is FrequencyChange:
+        return f"Freq: {event.frequency} GHz, Power: {event.power} W at {seconds(event.time, cfg):.1f}s"
+    return repr(event)
+
+
+# Sinks. Emitters check `enabled` before building an event, so a disabled
+# sink costs one attribute lookup per emit site.
+
+class NullSink:
+    enabled = False
+
+    def emit(self, event):
+        pass
+
+    def close(self):
+        pass
+
+
+NULL_SINK = NullSink()
+
+
+class CountingSink(NullSink):
+    enabled = True
+
+    def __init__(self):
+        self.counts = Counter()
+
+    def emit(self, event):
+        self.counts[type(event).__name__] += 1
+
+
+class RingBufferSink(NullSink):
+    # Keeps the most recent `capacity` events in memory
+    enabled = True
+
+    def __init__(self, capacity=10000):
+        self.events = deque(maxlen=capacity)
+
+    def emit(self, event):
+        self.events.append(event)
+
+
+class BufferSink(NullSink):
+    # Holds events until the consumer drains them
+    enabled = True
+
+    def __init__(self):
+        self.events = []
+
+    def emit(self, event):
+        self.events.append(event)
+
+    def drain(self):
+        events, self.events = self.events, []
+        return events
+
+
+class ConsoleSink(NullSink):
+    enabled = True
+
+    def __init__(self, cfg=None):
+        self.cfg = cfg or config.current()
+
+    def emit(self, event):
+        print(format_event(event, self.cfg))
+
+
+class FileSink(NullSink):
+    # Formats events into a buffer that is written out every `batch` events
+    enabled = True
+
+    def __init__(self, path, batch=4096, cfg=None):
+        self.cfg = cfg or config.current()
+        self.file = open(path, "w", buffering=1 << 16)
+        self.batch = batch
+        self.lines = []
+
+    def emit(self, event):
+        self.lines.append(format_event(event, self.cfg))
+        if len(self.lines) >= self.batch:
+            self.flush()
+
+    def flush(self):
+        if self.lines:
+            self.file.write("\n".join(self.lines))
+            self.file.write("\n")
+            self.lines = []
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,308 @@
+# workload.py
+
+import argparse
+import csv
+import heapq
+import json
+import mmap
+import random
+import struct
+import sys
+from array import array
+from collections import namedtuple
+
+import config
+from edf import EDFScheduler, CC_EDFScheduler
+from engine import Simulation
+from intervals import little_endian
+from task import Task
+from tracing import Completion
+
+# Trace-driven workloads: recorded jobs, each with its own release,
+# relative deadline and measured execution time, replayed through the EDF
+# schedulers instead of periodic tasks. Jobs are pulled from a stream one
+# at a time as the simulation reaches their release, and a job's Task is
+# dropped once its deadline has passed, so memory depends on how many jobs
+# overlap, not on the length of the trace.
+#
+# Times are ticks. `execution` is the job's actual work at max frequency;
+# `wcet` is what the scheduler is told up front (the execution time itself
+# when the trace has no estimate). Jobs must come in release order.
+Job = namedtuple("Job", "release deadline execution wcet name")
+
+
+# ---- Sources ----
+
+def read_csv(path, cfg=None):
+    # Columns release_sec, deadline_sec (relative), execution_sec and
+    # optionally wcet_sec and name; rows are read as they are needed
+    cfg = cfg or config.current()
+    with open(path, newline="") as f:
+        for i, row in enumerate(csv.DictReader(f)):
+            execution = cfg.ticks(float(row["execution_sec"]))
+            wcet = row.get("wcet_sec")
+            yield Job(cfg.ticks(float(row["release_sec"])), cfg.ticks(float(row["deadline_sec"])), execution,
+                      cfg.ticks(float(wcet)) if wcet not in (None, "") else execution, row.get("name") or default_name(i))
+
+
+# Binary traces follow intervals.py: a 32-byte header, the records as five
+# little-endian int64 columns per job (release, deadline, execution, wcet,
+# name index), then the names as a JSON list. A job named after its place
+# in the trace, as read_csv names unnamed rows, is stored with name index
+# UNNAMED and named again on reading, so the list holds only real names.
+MAGIC = b"EDFJ"
+VERSION = 2
+UNNAMED = -1
+HEADER = struct.Struct("<4sHHdQI4x")  # magic, version, reserved, time quantum, jobs, names bytes
+FIELDS = 5
+RECORD_SIZE = FIELDS * 8
+
+
+def default_name(i):
+    return f"Job{i + 1}"
+
+
+def write_jobs(path, jobs, cfg=None, chunk=8192):
+    # Streams `jobs` to a binary trace; only distinct real names are kept in memory
+    cfg = cfg or config.current()
+    names, index = [], {}
+    count = 0
+    buffer = array("q")
+    with open(path, "wb") as f:
+        f.write(bytes(HEADER.size))
+        for job in jobs:
+            name = job.name
+            if name == default_name(count):
+                name_index = UNNAMED
+            else:
+                name_index = index.get(name)
+                if name_index is None:
+                    name_index = index[name] = len(names)
+                    names.append(name)
+            buffer.extend((job.release, job.deadline, job.execution, job.wcet, name_index))
+            count += 1
+            if len(buffer) >= chunk * FIELDS:
+                little_endian(buffer).tofile(f)
+                buffer = array("q")
+        little_endian(buffer).tofile(f)
+        encoded = json.dumps(names).encode()
+        f.write(encoded)
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, 0, cfg.time_quantum, count, len(encoded)))
+    return count
+
+
+def read_header(f, path, cfg):
+    magic, version, _, time_quantum, count, names_length = HEADER.unpack(f.read(HEADER.size))
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a version {VERSION} job trace")
+    if time_quantum != cfg.time_quantum:
+        raise ValueError(f"{path} was recorded at {time_quantum}s ticks, not {cfg.time_quantum}s")
+    return count, names_length
+
+
+def read_jobs(path, cfg=None, chunk=8192):
+    # Streams a binary trace in chunks of `chunk` jobs
+    cfg = cfg or config.current()
+    with open(path, "rb") as f:
+        count, names_length = read_header(f, path, cfg)
+        f.seek(HEADER.size + count * RECORD_SIZE)
+        names = json.loads(f.read(names_length))
+        f.seek(HEADER.size)
+        done = 0
+        while done < count:
+            n = min(chunk, count - done)
+            records = array("q")
+            records.frombytes(f.read(n * RECORD_SIZE))
+            if sys.byteorder != "little":
+                records.byteswap()
+            for j, i in enumerate(range(0, n * FIELDS, FIELDS), done):
+                name_index = records[i + 4]
+                yield Job(records[i], records[i + 1], records[i + 2], records[i + 3],
+                          default_name(j) if name_index == UNNAMED else names[name_index])
+            done += n
+
+
+class JobTrace:
+    # A binary trace mapped read-only: random access by job index, and the
+    # OS pages records in as the replay reaches them
+    def __init__(self, path, cfg=None):
+        cfg = cfg or config.current()
+        if sys.byteorder != "little":
+            raise ValueError("Job traces can only be mapped on little-endian machines")
+        with open(path, "rb") as f:
+            count, names_length = read_header(f, path, cfg)
+            self.mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        end = HEADER.size + count * RECORD_SIZE
+        self.records = memoryview(self.mapping)[HEADER.size:end].cast("q")
+        self.names = json.loads(bytes(self.mapping[end:end + names_length]))
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        r, base = self.records, i * FIELDS
+        name_index = r[base + 4]
+        return Job(r[base], r[base + 1], r[base + 2], r[base + 3],
+                   default_name(i) if name_index == UNNAMED else self.names[name_index])
+
+    def __iter__(self):
+        return (self[i] for i in range(self.count))
+
+    def close(self):
+        self.records.release()
+        self.mapping.close()
+
+
+def periodic_jobs(tasks_info, cfg=None, exec_range=(100, 100), seed=None, until=None):
+    # The jobs of a periodic task set in release order, e.g. to record a
+    # trace from config.TASKS; execution times are drawn as in CC-EDF
+    cfg = cfg or config.current()
+    until = cfg.duration_ticks if until is None else until
+    rng = random.Random(seed)
+    low, high = exec_range[0] / 100.0, exec_range[1] / 100.0
+    heap = []
+    for i, info in enumerate(tasks_info):
+        period = cfg.ticks(info["period_sec"])
+        deadline = info.get("deadline_sec")
+        heap.append((0, i, period, cfg.ticks(deadline) if deadline is not None else period,
+                     cfg.ticks(info["execution_time_sec"]), info["name"]))
+    heapq.heapify(heap)
+    while heap and heap[0][0] < until:
+        release, i, period, deadline, wcet, name = heap[0]
+        execution = wcet
+        if low < 1 or high < 1:
+            execution = max(1, int(round(rng.uniform(low, high) * wcet)))
+        yield Job(release, deadline, execution, wcet, name)
+        heapq.heapreplace(heap, (release + period, i, period, deadline, wcet, name))
+
+
+# ---- Replay ----
+
+class ReplayMixin:
+    # Turns an EDF scheduler into a trace replayer. The pending queue only
+    # ever holds the next job of the stream; a released job is never queued
+    # again, and its task slot is reused once its deadline has passed.
+    # A job's density (wcet / relative deadline) stands in for a periodic
+    # task's utilization.
+
+    def start_replay(self, jobs):
+        self.jobs = iter(jobs)
+        self.free_ids = []
+        self.retiring = []  # (deadline, task_id) of completed jobs
+        self.last_release = 0
+        self.replayed = 0  # jobs released so far
+        self.queue_next_job()
+
+    def queue_next_job(self):
+        job = next(self.jobs, None)
+        if job is None:
+            return
+        if job.release < self.last_release:
+            raise ValueError(f"Job {job.name} released at tick {job.release}, before the job ahead of it")
+        self.last_release = job.release
+        task_id = self.free_ids.pop() if self.free_ids else len(self.tasks)
+        task = Task(job.name, 0, 0, None, None, job.release + job.deadline, task_id=task_id, cfg=self.cfg)
+        task.worst_case_execution_ticks = job.wcet
+        task.period_ticks = max(1, job.deadline)
+        task.actual_execution_ticks = task.remaining_ticks = job.execution
+        task.next_arrival_ticks = job.release
+        self.add_periodic_task(task)
+
+    def handle_arrivals(self):
+        while self.retiring and self.retiring[0][0] <= self.current_ticks:
+            self.retire(self.tasks[heapq.heappop(self.retiring)[1]])
+        while self.pending_tasks and self.pending_tasks[0][0] <= self.current_ticks:
+            super().handle_arrivals()
+            self.replayed += 1
+            self.queue_next_job()
+
+    def complete_task(self, task, min_percent=100, max_percent=100):
+        # The job is done for good: it keeps its slot (and, for CC-EDF, its
+        # share of the utilization) until its deadline
+        self.on_completion(task)
+        if self.trace.enabled:
+            self.trace.emit(Completion(self.current_ticks, task, task.deadline_ticks, task.actual_execution_ticks))
+        heapq.heappush(self.retiring, (task.deadline_ticks, task.task_id))
+        self.currently_running_task = None
+
+    def on_miss(self, task):
+        super().on_miss(task)
+        self.free(task)
+
+    def retire(self, task):
+        self.free(task)
+
+    def free(self, task):
+        self.tasks[task.task_id] = None
+        self.free_ids.append(task.task_id)
+
+
+class ReplayEDFScheduler(ReplayMixin, EDFScheduler):
+    pass
+
+
+class ReplayCC_EDFScheduler(ReplayMixin, CC_EDFScheduler):
+    def retire(self, task):
+        self.set_utilization(task, 0)
+        super().retire(task)
+
+
+def build_replay(jobs, algorithm="edf", frequency=None, trace=None, cfg=None):
+    # "edf" runs at `frequency` (default: max); "cc" is cycle-conserving
+    # EDF over the jobs' densities
+    cfg = cfg or config.current()
+    if algorithm == "cc":
+        scheduler = ReplayCC_EDFScheduler(cfg.frequency_list[0], cfg)
+        sim = Simulation(scheduler, [], trace=trace)
+    else:
+        frequency = cfg.max_frequency if frequency is None else frequency
+        scheduler = ReplayEDFScheduler(cfg)
+        sim = Simulation(scheduler, [], frequency, cfg.power_of[frequency], trace=trace)
+    scheduler.start_replay(jobs)
+    return sim
+
+
+def run_replay(jobs, algorithm="edf", frequency=None, until=None, trace=None, cfg=None):
+    sim = build_replay(jobs, algorithm, frequency, trace, cfg)
+    sim.run(sim.cfg.duration_ticks if until is None else until)
+    return sim.results()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a recorded job trace (CSV or binary) through EDF or CC-EDF")
+    parser.add_argument("trace", help="a .csv trace, or a binary trace written with --record")
+    parser.add_argument("--algorithm", choices=["edf", "cc"], default="edf")
+    parser.add_argument("--frequency", type=float, help="EDF frequency in GHz (default: max)")
+    parser.add_argument("--until", type=float, help="seconds to simulate (default: config duration)")
+    parser.add_argument("--mmap", action="store_true", help="map a binary trace instead of streaming it")
+    parser.add_argument("--record", action="store_true",
+                        help="write the jobs of config.TASKS to TRACE as a binary trace instead")
+    parser.add_argument("--convert", metavar="CSV", help="write the jobs of this CSV trace to TRACE instead")
+    parser.add_argument("--seed", type=int, default=None, help="--record: seed for the execution times")
+    args = parser.parse_args()
+
+    cfg = config.current()
+    if args.record or args.convert:
+        jobs = read_csv(args.convert, cfg) if args.convert else periodic_jobs(config.TASKS, cfg, cfg.cc_exec_range,
+                                                                              args.seed)
+        print(f"{write_jobs(args.trace, jobs, cfg)} jobs written to {args.trace}")
+    else:
+        mapped = None
+        if args.trace.lower().endswith(".csv"):
+            jobs = read_csv(args.trace, cfg)
+        elif args.mmap:
+            jobs = mapped = JobTrace(args.trace, cfg)
+        else:
+            jobs = read_jobs(args.trace, cfg)
+        until = None if args.until is None else cfg.ticks(args.until)
+        sim = build_replay(jobs, args.algorithm, args.frequency, cfg=cfg)
+        sim.run(cfg.duration_ticks if until is None else until)
+        energy, idle, missed = sim.results()
+        print(f"Replayed {sim.scheduler.replayed} jobs")
+        print(f"Energy: {energy:.2f} J, Idle: {idle:.2f}s, Missed: {missed}")
+        if mapped is not None:
+            mapped.close()
@@ -0,0 +1,7 @@
+# conftest.py
+
+import os
+import sys
+
+# The simulator modules import each other flat from src/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
@@ -0,0 +1,29 @@
+# test_admission.py
+
+import json
+
+from admission import AdmissionController
+
+
+def request(controller, **fields):
+    return json.loads(controller.handle_line(json.dumps(fields)))
+
+
+def test_null_deadline_is_an_implicit_deadline():
+    controller = AdmissionController()
+    task = {"name": "T1", "execution_time_sec": 2, "period_sec": 10, "deadline_sec": None}
+    assert request(controller, op="admit", set="s", task=task)["admitted"]
+    constrained = {"name": "T2", "execution_time_sec": 1, "period_sec": 10, "deadline_sec": 5}
+    assert request(controller, op="admit", set="s", task=constrained, exact=True)["admitted"]
+    status = request(controller, op="status", set="s")
+    assert status["ok"] and status["tasks"] == 2
+
+
+def test_bad_times_are_rejected_and_the_set_is_unchanged():
+    controller = AdmissionController()
+    for value in (True, "2", float("inf"), [1]):
+        task = {"name": "T1", "execution_time_sec": value, "period_sec": 10}
+        assert not request(controller, op="admit", set="s", task=task)["ok"]
+    task = {"name": "T1", "execution_time_sec": 2, "period_sec": 10, "deadline_sec": False}
+    assert not request(controller, op="admit", set="s", task=task)["ok"]
+    assert request(controller, op="status", set="s")["tasks"] == 0
@@ -0,0 +1,44 @@
+# test_analysis.py
+
+import math
+import random
+from fractions import Fraction
+
+import pytest
+
+import config
+from analysis import demand, is_feasible, is_feasible_params, task_parameters
+from batch import pack_task_sets
+
+
+def test_none_deadline_means_the_period():
+    cfg = config.current()
+    implicit = [{"name": "T1", "execution_time_sec": 2, "period_sec": 10}]
+    explicit_none = [{"name": "T1", "execution_time_sec": 2, "period_sec": 10, "deadline_sec": None}]
+    assert task_parameters(explicit_none, cfg.max_frequency, cfg) == task_parameters(implicit, cfg.max_frequency, cfg)
+    assert is_feasible(explicit_none, cfg.max_frequency, cfg)
+    assert (pack_task_sets([explicit_none], cfg)[2] == pack_task_sets([implicit], cfg)[2]).all()
+
+
+def brute_force_feasible(params):
+    # Demand at every absolute deadline up to one hyperperiod past the
+    # largest relative deadline
+    if sum(Fraction(c, p) for c, p, _ in params) > 1:
+        return False
+    horizon = max(d for _, _, d in params) + math.lcm(*(p for _, p, _ in params))
+    deadlines = {d + k * p for _, p, d in params for k in range((horizon - d) // p + 1)}
+    return all(demand(params, t) <= t for t in deadlines)
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_qpa_matches_brute_force(seed):
+    rng = random.Random(seed)
+    params = []
+    count = rng.randint(1, 6)
+    for _ in range(count):
+        period = rng.randint(2, 30)
+        # Utilizations around 1 / count, so sets land on both sides of feasible
+        execution = rng.randint(1, max(1, min(period, 2 * period // count)))
+        # Constrained deadlines, at least the execution time
+        params.append((execution, period, rng.randint(execution, period)))
+    assert is_feasible_params(params) == brute_force_feasible(params), params
@@ -0,0 +1,34 @@
+# test_batch.py
+
+import dataclasses
+import random
+
+import pytest
+
+import config
+from batch import simulate_static_batch
+from experiments import generate_task_set
+from main import get_static_frequency, run_schedule
+
+
+def test_batch_matches_scalar_simulator():
+    cfg = dataclasses.replace(config.current(), duration_seconds=300)
+    rng = random.Random(8)
+    # Ragged widths, and some sets that cannot meet every deadline
+    task_sets = [generate_task_set(rng.randint(1, 10), rng.uniform(0.2, 1.3), rng, max_period=50, cfg=cfg)
+                 for _ in range(60)]
+    energy, idle, missed = simulate_static_batch(task_sets, cfg=cfg)
+    for i, tasks in enumerate(task_sets):
+        expected = run_schedule(tasks, *get_static_frequency(tasks, cfg=cfg), cfg=cfg)
+        assert (energy[i], idle[i], missed[i]) == pytest.approx(expected), f"task set {i}"
+
+
+def test_batch_at_given_frequencies():
+    cfg = dataclasses.replace(config.current(), duration_seconds=300)
+    rng = random.Random(9)
+    task_sets = [generate_task_set(4, 0.5, rng, cfg=cfg) for _ in range(10)]
+    frequencies = [cfg.frequency_list[i % len(cfg.frequency_list)] for i in range(10)]
+    powers = [cfg.power_of[f] for f in frequencies]
+    energy, idle, missed = simulate_static_batch(task_sets, frequencies, powers, cfg=cfg)
+    for i, tasks in enumerate(task_sets):
+        assert (energy[i], idle[i], missed[i]) == pytest.approx(run_schedule(tasks, frequencies[i], powers[i], cfg=cfg))
@@ -0,0 +1,19 @@
+# test_cache.py
+
+from cache import result_key, trace_key
+
+TASKS = [{"name": "A", "execution_time_sec": 1, "period_sec": 4},
+         {"name": "B", "execution_time_sec": 2, "period_sec": 8}]
+RENAMED = [{"name": "X", "execution_time_sec": 1, "period_sec": 4},
+           {"name": "Y", "execution_time_sec": 2, "period_sec": 8}]
+
+
+def test_result_key_ignores_names_and_order():
+    assert result_key("EDF", TASKS, frequency=2.0) == result_key("EDF", RENAMED[::-1], frequency=2.0)
+
+
+def test_trace_key_follows_names_but_not_order():
+    assert trace_key("EDF trace", TASKS, frequency=2.0) == trace_key("EDF trace", TASKS[::-1], frequency=2.0)
+    assert trace_key("EDF trace", TASKS, frequency=2.0) != trace_key("EDF trace", RENAMED, frequency=2.0)
+    swapped = [dict(TASKS[0], name="B"), dict(TASKS[1], name="A")]
+    assert trace_key("EDF trace", TASKS, frequency=2.0) != trace_key("EDF trace", swapped, frequency=2.0)
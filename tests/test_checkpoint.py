@@ -0,0 +1,57 @@
+# test_checkpoint.py
+
+import dataclasses
+import random
+
+import pytest
+
+import config
+from checkpoint import fork, load, restore, save, snapshot
+from experiments import generate_task_set
+from main import build_cc_edf, build_la_edf, build_schedule, calculate_utilization, cc_safe_frequency
+
+
+def build(algorithm, tasks, cfg, seed):
+    if algorithm == "edf":
+        return build_schedule(tasks, cfg.max_frequency, cfg.max_power, cfg=cfg)
+    if algorithm == "la":
+        return build_la_edf(tasks, seed=seed, cfg=cfg)
+    # "cc-unseeded" draws from the global random module, which the snapshot carries
+    return build_cc_edf(tasks, cc_safe_frequency(calculate_utilization(tasks), cfg),
+                        seed=seed if algorithm == "cc" else None, cfg=cfg)
+
+
+@pytest.mark.parametrize("algorithm", ["edf", "cc", "cc-unseeded", "la"])
+@pytest.mark.parametrize("seed", range(8))
+def test_resumed_run_matches_uninterrupted_run(algorithm, seed):
+    cfg = dataclasses.replace(config.current(), duration_seconds=300)
+    rng = random.Random(seed)
+    tasks = generate_task_set(rng.randint(2, 8), rng.uniform(0.3, 1.1), rng, max_period=40, cfg=cfg)
+    random.seed(seed)
+    sim = build(algorithm, tasks, cfg, seed)
+    sim.run(rng.randint(1, cfg.duration_ticks - 1))
+    data = snapshot(sim)
+    sim.run(cfg.duration_ticks)
+
+    resumed = restore(data)
+    resumed.run(cfg.duration_ticks)
+    assert resumed.results() == sim.results()
+
+
+def test_save_load_and_fork(tmp_path):
+    cfg = dataclasses.replace(config.current(), duration_seconds=300)
+    tasks = generate_task_set(5, 0.8, random.Random(1), max_period=40, cfg=cfg)
+    sim = build("cc", tasks, cfg, 1)
+    sim.run(cfg.duration_ticks // 3)
+    path = tmp_path / "run.ckpt"
+    save(sim, str(path))
+    copies = fork(sim, 2) + [load(str(path))]
+    sim.run(cfg.duration_ticks)
+    for copy in copies:
+        copy.run(cfg.duration_ticks)
+        assert copy.results() == sim.results()
+
+
+def test_rejects_other_data():
+    with pytest.raises(ValueError):
+        restore(b"not a checkpoint")
@@ -0,0 +1,31 @@
+# test_cli.py
+
+import pytest
+
+from cli import main
+
+
+@pytest.fixture
+def task_file(tmp_path):
+    def write(rows):
+        path = tmp_path / "tasks.csv"
+        path.write_text("name,execution_time_sec,period_sec\n" + "".join(f"{row}\n" for row in rows))
+        return str(path)
+    return write
+
+
+@pytest.mark.parametrize("row", ["A,1,0", "A,1,-4", "A,0,4", "A,1,nan"])
+def test_bad_tasks_exit_with_status_2(task_file, row):
+    assert main([task_file([row]), "-a", "edf"]) == 2
+
+
+@pytest.mark.parametrize("args", [["--duration", "0.05"], ["--quantum", "0"], ["--quantum", "0.5", "--duration", "10"]])
+def test_bad_settings_exit_with_status_2(task_file, args):
+    # Shorter than a quantum: the whole run, then task B's execution time
+    assert main([task_file(["A,1,4", "B,0.25,4"]), "-a", "edf"] + args) == 2
+
+
+def test_valid_run(task_file, tmp_path):
+    out = tmp_path / "results.csv"
+    assert main([task_file(["A,1,4"]), "-a", "edf", "-f", "csv", "-o", str(out), "--duration", "10"]) == 0
+    assert out.read_text().splitlines()[1].startswith("edf,1,0.25,")
@@ -0,0 +1,42 @@
+# test_engine.py
+
+import dataclasses
+import random
+
+import pytest
+
+import config
+from experiments import generate_task_set
+from main import build_cc_edf, build_schedule, cc_safe_frequency, calculate_utilization, get_static_frequency
+
+
+def random_task_set(seed, cfg, high=1.2):
+    rng = random.Random(seed)
+    return generate_task_set(rng.randint(2, 8), rng.uniform(0.2, high), rng, max_period=40, cfg=cfg)
+
+
+def run_per_tick(sim, until):
+    # Reference: the old per-tick loop, one decision every quantum
+    while sim.scheduler.current_ticks < until:
+        sim.step(sim.scheduler.current_ticks + 1)
+    return sim.results()
+
+
+def builders(tasks, cfg, seed):
+    static = get_static_frequency(tasks, cfg=cfg)
+    safe = cc_safe_frequency(calculate_utilization(tasks), cfg)
+    return {
+        "edf": lambda: build_schedule(tasks, cfg.max_frequency, cfg.max_power, cfg=cfg),
+        "static": lambda: build_schedule(tasks, *static, cfg=cfg),
+        "cc": lambda: build_cc_edf(tasks, safe, seed=seed, cfg=cfg),
+    }
+
+
+@pytest.mark.parametrize("algorithm", ["edf", "static", "cc"])
+@pytest.mark.parametrize("seed", range(25))
+def test_event_engine_matches_tick_loop(algorithm, seed):
+    cfg = dataclasses.replace(config.current(), duration_seconds=150)
+    build = builders(random_task_set(seed, cfg), cfg, seed)[algorithm]
+    sim = build()
+    sim.run(cfg.duration_ticks)
+    assert sim.results() == pytest.approx(run_per_tick(build(), cfg.duration_ticks))
@@ -0,0 +1,32 @@
+# test_hyperperiod.py
+
+import dataclasses
+import random
+
+import pytest
+
+import config
+from experiments import generate_task_set
+from main import build_schedule, get_static_frequency, hyperperiod
+
+
+@pytest.mark.parametrize("periods", ["harmonic", "uniform"])
+@pytest.mark.parametrize("seed", range(20))
+def test_hyperperiod_shortcut_matches_full_run(periods, seed):
+    cfg = dataclasses.replace(config.current(), duration_seconds=3000, time_quantum=1)
+    rng = random.Random(seed)
+    tasks = generate_task_set(rng.randint(2, 5), rng.uniform(0.3, 1.2), rng, periods, 2, 16, cfg)
+    frequency, power = get_static_frequency(tasks, cfg=cfg) if seed % 2 else (cfg.max_frequency, cfg.max_power)
+
+    full = build_schedule(tasks, frequency, power, cfg=cfg)
+    full.run(cfg.duration_ticks)
+
+    short = build_schedule(tasks, frequency, power, cfg=cfg)
+    skip_cycles, skipped = short.skip_cycles, []
+    short.skip_cycles = lambda *args: skipped.append(skip_cycles(*args))
+    short.run_hyperperiods(cfg.duration_ticks, hyperperiod(tasks, cfg))
+
+    assert short.results() == pytest.approx(full.results())
+    assert short.scheduler.current_ticks == full.scheduler.current_ticks
+    if hyperperiod(tasks, cfg) * 4 <= cfg.duration_ticks:
+        assert skipped, "no repeating cycle was found"
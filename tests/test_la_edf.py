@@ -0,0 +1,69 @@
+# test_la_edf.py
+
+import dataclasses
+import heapq
+import random
+
+import pytest
+
+import config
+from edf import LA_EDFScheduler
+from engine import Simulation
+from experiments import generate_task_set
+from main import init_tasks, run_la_edf, seeded_fractions
+
+
+class SortingLA_EDFScheduler(LA_EDFScheduler):
+    # Reference: collects and sorts every outstanding job at each decision
+    def __init__(self, cfg=None):
+        super().__init__(cfg)
+        self.completed = []
+
+    def on_completion(self, task):
+        super().on_completion(task)
+        if task.deadline_ticks > self.current_ticks:
+            heapq.heappush(self.completed, (task.deadline_ticks, ~task.task_id))
+
+    def deferred_work(self):
+        now = self.current_ticks
+        while self.completed and self.completed[0][0] <= now:
+            heapq.heappop(self.completed)
+        entries = self.ready_queue + self.completed
+        running = self.currently_running_task
+        earliest = self.ready_queue[0][0] if self.ready_queue else running.deadline_ticks
+        if running:
+            entries.append((running.deadline_ticks, running.task_id))
+            earliest = min(earliest, running.deadline_ticks)
+        entries.sort(reverse=True)
+
+        utilization = self.total_utilization
+        must_run = 0.0
+        for deadline, task_id in entries:
+            if task_id < 0:
+                utilization -= self.utilization[~task_id]
+                continue
+            utilization -= self.utilization[task_id]
+            task = self.tasks[task_id]
+            left = task.worst_case_execution_ticks - task.actual_execution_ticks + task.remaining_ticks
+            window = deadline - earliest
+            if window:
+                room = (1 - utilization) * window
+                if room > 0:
+                    deferred = min(left, room)
+                    utilization += deferred / window
+                    left -= deferred
+            must_run += left
+        return must_run, earliest
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_matches_sorting_reference(seed):
+    cfg = dataclasses.replace(config.current(), duration_seconds=200)
+    rng = random.Random(seed)
+    tasks = generate_task_set(rng.randint(2, 12), rng.uniform(0.3, 1.3), rng, cfg=cfg)
+    fractions = seeded_fractions(tasks, seed, cfg.cc_exec_range)
+    reference = Simulation(SortingLA_EDFScheduler(cfg),
+                           init_tasks(tasks, cfg.max_frequency, cfg.max_power, cfg.cc_exec_range, fractions, cfg),
+                           exec_range=cfg.cc_exec_range)
+    reference.run(cfg.duration_ticks)
+    assert run_la_edf(tasks, seed=seed, cfg=cfg) == reference.results()
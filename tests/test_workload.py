@@ -0,0 +1,63 @@
+# test_workload.py
+
+import dataclasses
+import json
+import random
+
+import pytest
+
+import config
+from experiments import generate_task_set
+from main import get_static_frequency, run_cc_edf, run_schedule
+from workload import HEADER, RECORD_SIZE, Job, JobTrace, periodic_jobs, read_csv, read_jobs, run_replay, write_jobs
+
+
+def miss_free_task_set(seed, cfg):
+    rng = random.Random(seed)
+    return generate_task_set(rng.randint(2, 8), rng.uniform(0.2, 0.95), rng, max_period=40, cfg=cfg)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_periodic_replay_matches_run_schedule(seed):
+    cfg = dataclasses.replace(config.current(), duration_seconds=300)
+    tasks = miss_free_task_set(seed, cfg)
+    frequency, power = get_static_frequency(tasks, exact=True, cfg=cfg)
+    expected = run_schedule(tasks, frequency, power, cfg=cfg)
+    assert expected[2] == 0
+    assert run_replay(periodic_jobs(tasks, cfg), frequency=frequency, cfg=cfg) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_periodic_cc_replay_matches_run_cc_edf(seed):
+    # Full WCETs, so both sides see the same execution times
+    cfg = dataclasses.replace(config.current(), duration_seconds=300, cc_exec_range=(100, 100))
+    tasks = miss_free_task_set(seed, cfg)
+    expected = run_cc_edf(tasks, cfg.frequency_list[0], cfg=cfg)
+    assert run_replay(periodic_jobs(tasks, cfg), "cc", cfg=cfg) == pytest.approx(expected)
+
+
+def test_binary_trace_round_trip(tmp_path):
+    cfg = config.current()
+    jobs = list(periodic_jobs(config.TASKS, cfg, (50, 100), seed=3))
+    path = str(tmp_path / "jobs.bin")
+    assert write_jobs(path, jobs, cfg, chunk=7) == len(jobs)
+    assert list(read_jobs(path, cfg, chunk=5)) == jobs
+    trace = JobTrace(path, cfg)
+    assert list(trace) == jobs and trace[len(jobs) - 1] == jobs[-1]
+    trace.close()
+
+
+def test_unnamed_jobs_keep_the_name_table_small(tmp_path):
+    cfg = config.current()
+    source = tmp_path / "jobs.csv"
+    source.write_text("release_sec,deadline_sec,execution_sec,name\n" +
+                      "".join(f"{i},2,0.5,{'Named' if i % 1000 == 0 else ''}\n" for i in range(20000)))
+    path = str(tmp_path / "jobs.bin")
+    write_jobs(path, read_csv(str(source), cfg), cfg)
+    with open(path, "rb") as f:
+        *_, count, names_length = HEADER.unpack(f.read(HEADER.size))
+        f.seek(HEADER.size + count * RECORD_SIZE)
+        assert json.loads(f.read(names_length)) == ["Named"]
+    jobs = list(read_jobs(path, cfg))
+    assert jobs[1] == Job(cfg.ticks(1), cfg.ticks(2), cfg.ticks(0.5), cfg.ticks(0.5), "Job2")
+    assert jobs[1000].name == "Named" and jobs[-1].name == "Job20000"